@@ -2,9 +2,161 @@
 # Run with Administrator privileges
 
 param(
-    [string]$ServerUrl = "http://192.168.2.76:5000/api/report"
+    [string]$ServerUrl = "http://192.168.2.76:5000/api/report",
+    [string]$SpoolDir = "$env:ProgramData\PCMonitoring\spool",
+    [int]$SpoolBatchSize = 20,
+    [int]$MaxSpoolFiles = 60,
+    [switch]$NoCompression,
+    [ValidateSet("Cached", "Full")]
+    [string]$PstScanMode = "Cached",
+    [string]$PstIndexPath = "$env:ProgramData\PCMonitoring\pst-index.json",
+    [int]$PstRescanDays = 7
 )
 
+# Bulk endpoint used to replay spooled reports
+$BulkUrl = $ServerUrl -replace '/api/report/?$', '/api/report/bulk'
+
+# Send a JSON string to the server (gzip-compressed unless -NoCompression)
+function Send-JsonBody {
+    param(
+        [string]$Uri,
+        [string]$Json
+    )
+
+    $bodyBytes = [System.Text.Encoding]::UTF8.GetBytes($Json)
+    $headers = @{}
+
+    if (-not $NoCompression) {
+        $memoryStream = New-Object System.IO.MemoryStream
+        $gzipStream = New-Object System.IO.Compression.GZipStream($memoryStream, [System.IO.Compression.CompressionMode]::Compress)
+        $gzipStream.Write($bodyBytes, 0, $bodyBytes.Length)
+        $gzipStream.Close()
+        $bodyBytes = $memoryStream.ToArray()
+        $memoryStream.Dispose()
+        $headers["Content-Encoding"] = "gzip"
+    }
+
+    return Invoke-RestMethod -Uri $Uri -Method Post -Body $bodyBytes -Headers $headers -ContentType "application/json; charset=utf-8" -TimeoutSec 60
+}
+
+# Replay spooled reports (oldest first) to the bulk endpoint
+function Send-SpooledReports {
+    if (-not (Test-Path $SpoolDir)) {
+        return
+    }
+
+    $spooled = @(Get-ChildItem -Path $SpoolDir -Filter "report-*.json" -ErrorAction SilentlyContinue | Sort-Object Name)
+    if ($spooled.Count -eq 0) {
+        return
+    }
+
+    Write-Host "`nReplaying $($spooled.Count) spooled report(s)..." -ForegroundColor Yellow
+
+    for ($i = 0; $i -lt $spooled.Count; $i += $SpoolBatchSize) {
+        $batch = @($spooled[$i..([math]::Min($i + $SpoolBatchSize, $spooled.Count) - 1)])
+        $items = @()
+        foreach ($file in $batch) {
+            $items += [System.IO.File]::ReadAllText($file.FullName, [System.Text.Encoding]::UTF8)
+        }
+        $batchJson = "[" + ($items -join ",") + "]"
+
+        try {
+            $response = Send-JsonBody -Uri $BulkUrl -Json $batchJson
+            $batch | Remove-Item -Force -ErrorAction SilentlyContinue
+            Write-Host "  Replayed $($batch.Count) report(s): $($response.message)" -ForegroundColor Green
+        } catch {
+            Write-Host "  Replay failed, keeping spool for next run: $($_.Exception.Message)" -ForegroundColor Yellow
+            return
+        }
+    }
+}
+
+# Save a report that could not be sent; keep only the newest $MaxSpoolFiles
+function Save-ReportToSpool {
+    param([string]$Json)
+
+    if (-not (Test-Path $SpoolDir)) {
+        New-Item -Path $SpoolDir -ItemType Directory -Force | Out-Null
+    }
+
+    $spoolFile = Join-Path $SpoolDir ("report-" + (Get-Date).ToString("yyyyMMdd-HHmmss") + ".json")
+    [System.IO.File]::WriteAllText($spoolFile, $Json, (New-Object System.Text.UTF8Encoding($false)))
+    Write-Host "Data spooled locally: $spoolFile" -ForegroundColor Yellow
+
+    $spooled = @(Get-ChildItem -Path $SpoolDir -Filter "report-*.json" -ErrorAction SilentlyContinue | Sort-Object Name)
+    if ($spooled.Count -gt $MaxSpoolFiles) {
+        $spooled | Select-Object -First ($spooled.Count - $MaxSpoolFiles) | Remove-Item -Force -ErrorAction SilentlyContinue
+    }
+}
+
+# Recursively scan PST locations in parallel runspaces, returns full paths
+function Find-PstFilesParallel {
+    param([string[]]$Locations)
+
+    $pool = [RunspaceFactory]::CreateRunspacePool(1, [math]::Max(1, [math]::Min($Locations.Count, 4)))
+    $pool.Open()
+
+    $jobs = @()
+    foreach ($location in $Locations) {
+        $ps = [PowerShell]::Create()
+        $ps.RunspacePool = $pool
+        [void]$ps.AddScript({
+            param($path)
+            Get-ChildItem -Path $path -Filter "*.pst" -Recurse -File -ErrorAction SilentlyContinue |
+                ForEach-Object { $_.FullName }
+        }).AddArgument($location)
+        $jobs += @{ PowerShell = $ps; Handle = $ps.BeginInvoke() }
+    }
+
+    $paths = @()
+    foreach ($job in $jobs) {
+        $paths += @($job.PowerShell.EndInvoke($job.Handle))
+        $job.PowerShell.Dispose()
+    }
+
+    $pool.Close()
+    $pool.Dispose()
+
+    return @($paths | Where-Object { $_ } | Sort-Object -Unique)
+}
+
+# Load the local PST index (known paths + time of last full scan)
+function Read-PstIndex {
+    if (-not (Test-Path $PstIndexPath)) {
+        return $null
+    }
+
+    try {
+        return Get-Content -Path $PstIndexPath -Raw -Encoding UTF8 | ConvertFrom-Json
+    } catch {
+        return $null
+    }
+}
+
+function Save-PstIndex {
+    param(
+        [string]$LastFullScan,
+        [object[]]$Files
+    )
+
+    $indexDir = Split-Path -Parent $PstIndexPath
+    if (-not (Test-Path $indexDir)) {
+        New-Item -Path $indexDir -ItemType Directory -Force | Out-Null
+    }
+
+    $index = @{
+        last_full_scan = $LastFullScan
+        files = @($Files | ForEach-Object {
+            @{
+                path = $_.FullName
+                size = $_.Length
+                last_write = $_.LastWriteTime.ToString("yyyy-MM-dd HH:mm:ss")
+            }
+        })
+    }
+    $index | ConvertTo-Json -Depth 5 | Out-File -FilePath $PstIndexPath -Encoding UTF8
+}
+
 # Script start log
 Write-Host "=== PC Information Collection Started ===" -ForegroundColor Green
 
@@ -45,31 +197,76 @@ Write-Host "`nSearching for Outlook PST files..." -ForegroundColor Yellow
 $pstFiles = @()
 $totalPstSize = 0
 
-# Common PST file locations
+# Common PST file locations (nested/duplicate entries collapse to the same files)
 $pstLocations = @(
     "$env:USERPROFILE\Documents\Outlook Files",
     "$env:LOCALAPPDATA\Microsoft\Outlook",
     "$env:APPDATA\Local\Microsoft\Outlook",
     "$env:USERPROFILE\AppData\Local\Microsoft\Outlook"
-)
+) | Where-Object { Test-Path $_ } | Sort-Object -Unique
+
+# Cached mode: stat the files from the local index and only list the top level
+# of each location; fall back to a full parallel rescan when the index is
+# missing, older than $PstRescanDays, or a known file has disappeared
+$pstIndex = if ($PstScanMode -eq "Cached") { Read-PstIndex } else { $null }
+$needFullScan = $true
+$lastFullScan = (Get-Date).ToString("yyyy-MM-dd HH:mm:ss")
+$foundFiles = @()
+
+if ($pstIndex -and $pstIndex.last_full_scan) {
+    $indexAge = (Get-Date) - [datetime]::ParseExact($pstIndex.last_full_scan, "yyyy-MM-dd HH:mm:ss", $null)
+    if ($indexAge.TotalDays -lt $PstRescanDays) {
+        $needFullScan = $false
+        $lastFullScan = $pstIndex.last_full_scan
+
+        foreach ($known in @($pstIndex.files)) {
+            $item = Get-Item -LiteralPath $known.path -ErrorAction SilentlyContinue
+            if ($item) {
+                $foundFiles += $item
+            } else {
+                $needFullScan = $true
+                break
+            }
+        }
 
-foreach ($location in $pstLocations) {
-    if (Test-Path $location) {
-        $files = Get-ChildItem -Path $location -Filter "*.pst" -Recurse -ErrorAction SilentlyContinue
-        foreach ($file in $files) {
-            $sizeGB = [math]::Round($file.Length / 1GB, 2)
-            $pstFiles += @{
-                name = $file.Name
-                path = $file.FullName
-                size_gb = $sizeGB
-                last_modified = $file.LastWriteTime.ToString("yyyy-MM-dd HH:mm:ss")
+        if (-not $needFullScan) {
+            $knownPaths = @($foundFiles | ForEach-Object { $_.FullName })
+            foreach ($location in $pstLocations) {
+                Get-ChildItem -Path $location -Filter "*.pst" -File -ErrorAction SilentlyContinue |
+                    Where-Object { $knownPaths -notcontains $_.FullName } |
+                    ForEach-Object { $foundFiles += $_ }
             }
-            $totalPstSize += $sizeGB
-            Write-Host "  Found: $($file.Name) - ${sizeGB}GB" -ForegroundColor White
+            Write-Host "  Using PST index (last full scan: $lastFullScan)" -ForegroundColor Gray
         }
     }
 }
 
+if ($needFullScan) {
+    Write-Host "  Full PST scan of $(@($pstLocations).Count) location(s)..." -ForegroundColor Gray
+    $foundFiles = @(Find-PstFilesParallel -Locations @($pstLocations) |
+        ForEach-Object { Get-Item -LiteralPath $_ -ErrorAction SilentlyContinue } |
+        Where-Object { $_ })
+    $lastFullScan = (Get-Date).ToString("yyyy-MM-dd HH:mm:ss")
+}
+
+foreach ($file in $foundFiles) {
+    $sizeGB = [math]::Round($file.Length / 1GB, 2)
+    $pstFiles += @{
+        name = $file.Name
+        path = $file.FullName
+        size_gb = $sizeGB
+        last_modified = $file.LastWriteTime.ToString("yyyy-MM-dd HH:mm:ss")
+    }
+    $totalPstSize += $sizeGB
+    Write-Host "  Found: $($file.Name) - ${sizeGB}GB" -ForegroundColor White
+}
+
+try {
+    Save-PstIndex -LastFullScan $lastFullScan -Files $foundFiles
+} catch {
+    Write-Host "  Warning: Could not update PST index: $($_.Exception.Message)" -ForegroundColor Yellow
+}
+
 if ($pstFiles.Count -eq 0) {
     Write-Host "  No PST files found." -ForegroundColor Gray
 }
@@ -258,17 +455,19 @@ Write-Host "`nSending data to server..." -ForegroundColor Yellow
 Write-Host "Server URL: $ServerUrl" -ForegroundColor Cyan
 
 try {
-    $response = Invoke-RestMethod -Uri $ServerUrl -Method Post -Body $jsonData -ContentType "application/json; charset=utf-8"
+    # Flush reports left over from earlier runs first (oldest first) so the
+    # current report is stored last and stays the PC's latest on the server
+    Send-SpooledReports
+
+    $response = Send-JsonBody -Uri $ServerUrl -Json $jsonData
     Write-Host "[SUCCESS] Data sent successfully!" -ForegroundColor Green
     Write-Host "Server response: $($response.message)" -ForegroundColor Green
 } catch {
     Write-Host "[FAILED] Data transmission failed!" -ForegroundColor Red
     Write-Host "Error: $($_.Exception.Message)" -ForegroundColor Red
 
-    # Save locally if transmission fails
-    $localLogPath = "$env:TEMP\pc-info-report.json"
-    $jsonData | Out-File -FilePath $localLogPath -Encoding UTF8
-    Write-Host "Data saved locally: $localLogPath" -ForegroundColor Yellow
+    # Spool locally so the next successful run can replay it
+    Save-ReportToSpool -Json $jsonData
 }
 
 Write-Host "`n=== Collection Complete ===" -ForegroundColor Green
@@ -3,7 +3,8 @@
 # Usage: powershell -ExecutionPolicy Bypass -File "\\server\share\client\quick-install.ps1"
 
 param(
-    [string]$ServerUrl = "http://192.168.2.76:5000/api/report"
+    [string]$ServerUrl = "http://192.168.2.76:5000/api/report",
+    [int]$JitterWindowMinutes = 60
 )
 
 Write-Host "============================================================" -ForegroundColor Cyan
@@ -48,13 +49,22 @@ if (Test-Path "$scriptDir\collect-info.ps1") {
 Write-Host ""
 Write-Host "[Step 3/3] Setting up scheduled task..." -ForegroundColor Yellow
 Write-Host "  Server URL: $ServerUrl" -ForegroundColor Cyan
-Write-Host "  Schedule: Daily at 12:00 PM" -ForegroundColor Cyan
+
+# Deterministic per-host jitter: spread PCs over a window after 12:00 PM
+# so the server does not receive every report at the same moment
+$md5 = [System.Security.Cryptography.MD5]::Create()
+$hostHash = $md5.ComputeHash([System.Text.Encoding]::UTF8.GetBytes($env:COMPUTERNAME.ToUpper()))
+$jitterMinutes = [int]([BitConverter]::ToUInt32($hostHash, 0) % [uint32][math]::Max(1, $JitterWindowMinutes))
+$scheduledTime = (Get-Date -Hour 12 -Minute 0 -Second 0).AddMinutes($jitterMinutes)
+$scheduleLabel = "Daily at " + $scheduledTime.ToString("hh:mm tt") + " (12:00 PM + $jitterMinutes min jitter)"
+
+Write-Host "  Schedule: $scheduleLabel" -ForegroundColor Cyan
 
 # Create scheduled task
 $action = New-ScheduledTaskAction -Execute "powershell.exe" `
     -Argument "-WindowStyle Hidden -ExecutionPolicy Bypass -File `"C:\Scripts\collect-info.ps1`" -ServerUrl `"$ServerUrl`""
 
-$trigger = New-ScheduledTaskTrigger -Daily -At "12:00PM"
+$trigger = New-ScheduledTaskTrigger -Daily -At $scheduledTime
 
 $principal = New-ScheduledTaskPrincipal -UserId "$env:USERDOMAIN\$env:USERNAME" `
     -LogonType Interactive -RunLevel Highest
@@ -72,7 +82,7 @@ try {
         -Trigger $trigger `
         -Principal $principal `
         -Settings $settings `
-        -Description "Collects PC information and sends to monitoring server - runs daily at 12:00 PM" `
+        -Description "Collects PC information and sends to monitoring server - runs $scheduleLabel" `
         -Force | Out-Null
 
     Write-Host "  OK - Scheduled task created" -ForegroundColor Green
@@ -91,7 +101,7 @@ Write-Host ""
 Write-Host "Configuration:" -ForegroundColor Cyan
 Write-Host "  Computer: $env:COMPUTERNAME" -ForegroundColor White
 Write-Host "  Task Name: PC Monitoring Collection" -ForegroundColor White
-Write-Host "  Schedule: Daily at 12:00 PM" -ForegroundColor White
+Write-Host "  Schedule: $scheduleLabel" -ForegroundColor White
 Write-Host "  Server: $ServerUrl" -ForegroundColor White
 Write-Host ""
 
@@ -1,6 +1,10 @@
 # Setup PC Monitoring Scheduled Task
 # Run this script as Administrator
 
+param(
+    [int]$JitterWindowMinutes = 60
+)
+
 Write-Host "Setting up PC Monitoring scheduled task..." -ForegroundColor Green
 Write-Host ""
 
@@ -17,17 +21,25 @@ if (-not $isAdmin) {
 # Server URL - modify this if your server IP is different
 $serverUrl = "http://192.168.2.76:5000/api/report"
 
+# Deterministic per-host jitter: spread PCs over a window after 12:00 PM
+# so the server does not receive every report at the same moment
+$md5 = [System.Security.Cryptography.MD5]::Create()
+$hostHash = $md5.ComputeHash([System.Text.Encoding]::UTF8.GetBytes($env:COMPUTERNAME.ToUpper()))
+$jitterMinutes = [int]([BitConverter]::ToUInt32($hostHash, 0) % [uint32][math]::Max(1, $JitterWindowMinutes))
+$scheduledTime = (Get-Date -Hour 12 -Minute 0 -Second 0).AddMinutes($jitterMinutes)
+$scheduleLabel = "Daily at " + $scheduledTime.ToString("hh:mm tt") + " (12:00 PM + $jitterMinutes min jitter)"
+
 Write-Host "Configuration:" -ForegroundColor Cyan
 Write-Host "  Script Path: C:\Scripts\collect-info.ps1"
 Write-Host "  Server URL: $serverUrl"
-Write-Host "  Schedule: Daily at 12:00 PM"
+Write-Host "  Schedule: $scheduleLabel"
 Write-Host ""
 
 # Create scheduled task
 $action = New-ScheduledTaskAction -Execute "powershell.exe" `
     -Argument "-WindowStyle Hidden -ExecutionPolicy Bypass -File `"C:\Scripts\collect-info.ps1`" -ServerUrl `"$serverUrl`""
 
-$trigger = New-ScheduledTaskTrigger -Daily -At "12:00PM"
+$trigger = New-ScheduledTaskTrigger -Daily -At $scheduledTime
 
 $principal = New-ScheduledTaskPrincipal -UserId "$env:USERDOMAIN\$env:USERNAME" `
     -LogonType Interactive -RunLevel Highest
@@ -46,14 +58,14 @@ try {
         -Trigger $trigger `
         -Principal $principal `
         -Settings $settings `
-        -Description "Collects PC information and sends to monitoring server - runs daily at 12:00 PM" `
+        -Description "Collects PC information and sends to monitoring server - runs $scheduleLabel" `
         -Force
 
     Write-Host "[SUCCESS] Scheduled task created successfully!" -ForegroundColor Green
     Write-Host ""
     Write-Host "Task Details:" -ForegroundColor Cyan
     Write-Host "  Name: PC Monitoring Collection"
-    Write-Host "  Schedule: Every day at 12:00 PM"
+    Write-Host "  Schedule: $scheduleLabel"
     Write-Host "  Status: Enabled"
     Write-Host ""
     Write-Host "You can manage this task in Task Scheduler (taskschd.msc)" -ForegroundColor Yellow
@@ -4,14 +4,69 @@ PC 모니터링 서버
 Flask를 사용한 웹 서버 및 API
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template
 from database import Database
+import migrations
+import export
+import ingest
 from datetime import datetime
-import json
 
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False  # 한글 지원
-db = Database()
+db = Database()  # 스키마 마이그레이션은 여기서 한 번 적용됨
+
+# 남은 데이터 백필은 리포트 수신과 함께 백그라운드에서 진행
+migrations.start_backfill_worker(db.db_path)
+
+# ==================== 수신 헬퍼 ====================
+
+def get_request_json():
+    """
+    요청 본문을 JSON으로 파싱 (본문 해석 규칙은 ingest 모듈 참고)
+
+    클라이언트가 Content-Encoding: gzip 으로 압축해서 보낸 경우 먼저 압축을 해제합니다.
+    본문이 없거나 파싱할 수 없으면 None을 반환합니다.
+    본문(압축 해제 후)이 ingest.MAX_REQUEST_BODY_BYTES를 넘으면 ingest.RequestTooLarge를 발생시킵니다.
+    """
+    # Content-Length가 없는 요청(chunked)도 있으므로 읽은 뒤에도 크기 확인
+    ingest.check_body_size(request.content_length)
+    data = request.get_data()
+    ingest.check_body_size(len(data))
+
+    if request.headers.get('Content-Encoding', '').lower() == 'gzip':
+        return ingest.parse_gzip_json(data)
+
+    return request.get_json(silent=True)
+
+def store_report(report_data):
+    """
+    검증된 리포트를 저장하고 아카이브 날짜를 갱신
+
+    Returns:
+        저장된 리포트 ID
+    """
+    # 데이터베이스에 저장
+    report_id = db.save_report(report_data)
+
+    # 아카이브 날짜가 있으면 자동으로 저장
+    if report_data.get('last_archive_date'):
+        # Extract date only (YYYY-MM-DD) from timestamp format
+        archive_date = ingest.normalize_archive_date(report_data['last_archive_date'])
+
+        db.set_archive_date(
+            report_data['computer_name'],
+            archive_date,
+            report_data.get('windows_user'),
+            report_data.get('user_name'),
+            report_data.get('timestamp')
+        )
+        print(f"  아카이브 날짜 자동 저장: {archive_date}")
+
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
+          f"리포트 수신: {report_data['computer_name']} "
+          f"(사용자: {report_data['user_name']}) - ID: {report_id}")
+
+    return report_id
 
 # ==================== 웹 페이지 라우트 ====================
 
@@ -28,10 +83,10 @@ def receive_report():
     클라이언트로부터 PC 정보 수신
 
     POST /api/report
-    Body: JSON 형태의 PC 정보
+    Body: JSON 형태의 PC 정보 (Content-Encoding: gzip 지원)
     """
     try:
-        report_data = request.get_json()
+        report_data = get_request_json()
 
         if not report_data:
             return jsonify({
@@ -40,35 +95,14 @@ def receive_report():
             }), 400
 
         # 필수 필드 검증
-        required_fields = ['computer_name', 'user_name', 'timestamp']
-        for field in required_fields:
-            if field not in report_data:
-                return jsonify({
-                    'status': 'error',
-                    'message': f'필수 필드가 누락되었습니다: {field}'
-                }), 400
-
-        # 데이터베이스에 저장
-        report_id = db.save_report(report_data)
-
-        # 아카이브 날짜가 있으면 자동으로 저장
-        if report_data.get('last_archive_date'):
-            # Extract date only (YYYY-MM-DD) from timestamp format
-            archive_date = report_data['last_archive_date']
-            if ' ' in archive_date:
-                archive_date = archive_date.split(' ')[0]
-
-            db.set_archive_date(
-                report_data['computer_name'],
-                archive_date,
-                report_data.get('windows_user'),
-                report_data.get('user_name')
-            )
-            print(f"  아카이브 날짜 자동 저장: {archive_date}")
-
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-              f"리포트 수신: {report_data['computer_name']} "
-              f"(사용자: {report_data['user_name']}) - ID: {report_id}")
+        missing_field = ingest.validate_report(report_data)
+        if missing_field:
+            return jsonify({
+                'status': 'error',
+                'message': f'필수 필드가 누락되었습니다: {missing_field}'
+            }), 400
+
+        report_id = store_report(report_data)
 
         return jsonify({
             'status': 'success',
@@ -76,6 +110,60 @@ def receive_report():
             'report_id': report_id
         }), 200
 
+    except ingest.RequestTooLarge as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'서버 오류: {str(e)}'
+        }), 500
+
+@app.route('/api/report/bulk', methods=['POST'])
+def receive_report_bulk():
+    """
+    클라이언트 스풀에 쌓인 리포트 일괄 수신
+
+    POST /api/report/bulk
+    Body: PC 정보 JSON 배열 (Content-Encoding: gzip 지원)
+    """
+    try:
+        reports = get_request_json()
+
+        bulk_error = ingest.validate_bulk(reports)
+        if bulk_error:
+            return jsonify({
+                'status': 'error',
+                'message': bulk_error
+            }), 400
+
+        report_ids = []
+        errors = []
+        for index, report_data in enumerate(reports):
+            item_error = ingest.bulk_item_error(report_data)
+            if item_error:
+                errors.append({'index': index, 'message': item_error})
+                continue
+
+            report_ids.append(store_report(report_data))
+
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(report_ids)}개의 리포트가 저장되었습니다.',
+            'report_ids': report_ids,
+            'errors': errors
+        }), 200
+
+    except ingest.RequestTooLarge as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+
     except Exception as e:
         print(f"오류 발생: {str(e)}")
         return jsonify({
@@ -104,6 +192,54 @@ def get_latest_reports():
             'message': f'서버 오류: {str(e)}'
         }), 500
 
+@app.route('/api/reports/summary', methods=['GET'])
+def get_report_summaries():
+    """
+    각 PC의 최신 리포트 요약 조회 (대시보드 카드용, PST/메일 계정 목록 제외)
+
+    GET /api/reports/summary
+    """
+    try:
+        summaries = db.get_report_summaries()
+        return jsonify({
+            'status': 'success',
+            'data': summaries,
+            'count': len(summaries)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'서버 오류: {str(e)}'
+        }), 500
+
+@app.route('/api/reports/latest/<computer_name>', methods=['GET'])
+def get_latest_report(computer_name):
+    """
+    특정 PC의 최신 리포트 전체 조회 (상세 화면용)
+
+    GET /api/reports/latest/<computer_name>
+    """
+    try:
+        report = db.get_latest_report(computer_name)
+
+        if not report:
+            return jsonify({
+                'status': 'error',
+                'message': f'리포트가 없습니다: {computer_name}'
+            }), 404
+
+        return jsonify({
+            'status': 'success',
+            'data': report
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'서버 오류: {str(e)}'
+        }), 500
+
 @app.route('/api/reports/history/<computer_name>', methods=['GET'])
 def get_pc_history(computer_name):
     """
@@ -127,6 +263,98 @@ def get_pc_history(computer_name):
             'message': f'서버 오류: {str(e)}'
         }), 500
 
+@app.route('/api/search', methods=['GET'])
+def search_pcs():
+    """
+    PC 검색 (컴퓨터 이름, 사용자 이름, 표시 이름, PST 경로, 이메일 계정)
+
+    GET /api/search?q=hong&limit=50
+    """
+    try:
+        query = request.args.get('q', default='', type=str).strip()
+        limit = request.args.get('limit', default=50, type=int)
+
+        if not query:
+            return jsonify({
+                'status': 'error',
+                'message': '검색어(q)가 필요합니다.'
+            }), 400
+
+        results = db.search(query, max(1, min(limit, 500)))
+        return jsonify({
+            'status': 'success',
+            'data': results,
+            'count': len(results)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'서버 오류: {str(e)}'
+        }), 500
+
+@app.route('/api/forecast', methods=['GET'])
+def get_forecast():
+    """
+    드라이브/PST 용량 예측 (가득 찰 때까지 남은 일수)
+
+    GET /api/forecast?days=90&computer_name=<pc>
+    days: 이 일수 안에 가득 차는 항목만 반환 (0이면 증가 중인 항목 전부)
+    """
+    try:
+        days = request.args.get('days', default=90, type=int)
+        computer_name = request.args.get('computer_name', default=None, type=str)
+
+        forecasts = db.get_forecasts(days if days > 0 else None, computer_name)
+        return jsonify({
+            'status': 'success',
+            'data': forecasts,
+            'count': len(forecasts)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'서버 오류: {str(e)}'
+        }), 500
+
+@app.route('/api/export', methods=['GET'])
+def export_data():
+    """
+    리포트 데이터 내보내기 (스트리밍)
+
+    GET /api/export?format=csv&table=reports&since=2025-01-01&until=2025-01-31&computer_name=PC1
+    format: csv, ndjson, parquet (pyarrow 설치 시)
+    table: reports (리포트당 1행), drives (드라이브당 1행), pst (PST 파일당 1행)
+    computer_name: 여러 번 지정 가능
+    """
+    try:
+        fmt = request.args.get('format', default='csv', type=str)
+        table = request.args.get('table', default='reports', type=str)
+        since = request.args.get('since', default=None, type=str)
+        until = request.args.get('until', default=None, type=str)
+        computer_names = request.args.getlist('computer_name')
+
+        reports = db.iter_reports(since, until, computer_names)
+        chunks = export.stream_export(reports, table, fmt)
+
+        filename = f"pc-monitoring-{table}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+        return Response(chunks, mimetype=export.EXPORT_FORMATS[fmt], headers={
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        })
+
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'서버 오류: {str(e)}'
+        }), 500
+
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """
@@ -325,8 +553,14 @@ if __name__ == '__main__':
     print()
     print("🔌 API 엔드포인트:")
     print("   - POST   /api/report                : 리포트 수신")
+    print("   - POST   /api/report/bulk           : 스풀 리포트 일괄 수신")
     print("   - GET    /api/reports/latest        : 최신 리포트 조회")
+    print("   - GET    /api/reports/summary       : 최신 리포트 요약 조회 (대시보드)")
+    print("   - GET    /api/reports/latest/<pc>   : PC 최신 리포트 상세 조회")
     print("   - GET    /api/reports/history/<pc>  : PC 히스토리 조회")
+    print("   - GET    /api/search?q=             : PC/사용자/PST/메일 계정 검색")
+    print("   - GET    /api/forecast              : 용량 예측 조회")
+    print("   - GET    /api/export                : 데이터 내보내기 (CSV/NDJSON/Parquet)")
     print("   - GET    /api/statistics            : 통계 조회")
     print("   - GET    /api/alerts                : 경고 조회")
     print("   - GET    /api/user-mappings         : 사용자 이름 매핑 조회")
@@ -0,0 +1,510 @@
+# -*- coding: utf-8 -*-
+"""
+PC 모니터링 서버 (ASGI 버전)
+Quart를 사용한 비동기 웹 서버 및 API
+
+app.py(Flask)와 같은 URL과 같은 JSON 응답 형식을 제공합니다.
+DB 작업은 AsyncDatabase를 통해 실행되어 요청 처리 중 이벤트 루프를 막지 않습니다.
+
+실행:
+    hypercorn asgi_app:app --bind 0.0.0.0:5000
+"""
+
+from quart import Quart, Response, request, jsonify, render_template
+from database import Database
+from async_database import AsyncDatabase
+import migrations
+import export
+import ingest
+from datetime import datetime
+
+app = Quart(__name__)
+app.json.ensure_ascii = False  # 한글 지원
+db = AsyncDatabase(Database())  # 스키마 마이그레이션은 여기서 한 번 적용됨
+
+@app.before_serving
+async def start_database():
+    """writer 태스크와 백그라운드 백필 시작"""
+    await db.start()
+    migrations.start_backfill_worker(db.db.db_path)
+
+@app.after_serving
+async def close_database():
+    """남은 쓰기 작업 처리 후 종료"""
+    await db.close()
+
+# ==================== 수신 헬퍼 ====================
+
+async def get_request_json():
+    """
+    요청 본문을 JSON으로 파싱 (본문 해석 규칙은 ingest 모듈 참고)
+
+    클라이언트가 Content-Encoding: gzip 으로 압축해서 보낸 경우 먼저 압축을 해제합니다.
+    본문이 없거나 파싱할 수 없으면 None을 반환합니다.
+    본문(압축 해제 후)이 ingest.MAX_REQUEST_BODY_BYTES를 넘으면 ingest.RequestTooLarge를 발생시킵니다.
+    """
+    # Content-Length가 없는 요청(chunked)도 있으므로 읽은 뒤에도 크기 확인
+    ingest.check_body_size(request.content_length)
+    data = await request.get_data()
+    ingest.check_body_size(len(data))
+
+    if request.headers.get('Content-Encoding', '').lower() == 'gzip':
+        return ingest.parse_gzip_json(data)
+
+    return await request.get_json(silent=True)
+
+async def store_report(report_data):
+    """
+    검증된 리포트를 저장하고 아카이브 날짜를 갱신
+
+    Returns:
+        저장된 리포트 ID
+    """
+    report_id = await db.save_report(report_data)
+
+    if report_data.get('last_archive_date'):
+        archive_date = ingest.normalize_archive_date(report_data['last_archive_date'])
+
+        await db.set_archive_date(
+            report_data['computer_name'],
+            archive_date,
+            report_data.get('windows_user'),
+            report_data.get('user_name'),
+            report_data.get('timestamp')
+        )
+
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
+          f"리포트 수신: {report_data['computer_name']} "
+          f"(사용자: {report_data['user_name']}) - ID: {report_id}")
+
+    return report_id
+
+def server_error(e):
+    return jsonify({
+        'status': 'error',
+        'message': f'서버 오류: {str(e)}'
+    }), 500
+
+# ==================== 웹 페이지 라우트 ====================
+
+@app.route('/')
+async def index():
+    """대시보드 메인 페이지"""
+    return await render_template('dashboard.html')
+
+# ==================== API 라우트 ====================
+
+@app.route('/api/report', methods=['POST'])
+async def receive_report():
+    """
+    클라이언트로부터 PC 정보 수신
+
+    POST /api/report
+    Body: JSON 형태의 PC 정보 (Content-Encoding: gzip 지원)
+    """
+    try:
+        report_data = await get_request_json()
+
+        if not report_data:
+            return jsonify({
+                'status': 'error',
+                'message': '데이터가 없습니다.'
+            }), 400
+
+        missing_field = ingest.validate_report(report_data)
+        if missing_field:
+            return jsonify({
+                'status': 'error',
+                'message': f'필수 필드가 누락되었습니다: {missing_field}'
+            }), 400
+
+        report_id = await store_report(report_data)
+
+        return jsonify({
+            'status': 'success',
+            'message': '리포트가 성공적으로 저장되었습니다.',
+            'report_id': report_id
+        }), 200
+
+    except ingest.RequestTooLarge as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        return server_error(e)
+
+@app.route('/api/report/bulk', methods=['POST'])
+async def receive_report_bulk():
+    """
+    클라이언트 스풀에 쌓인 리포트 일괄 수신
+
+    POST /api/report/bulk
+    Body: PC 정보 JSON 배열 (Content-Encoding: gzip 지원)
+    """
+    try:
+        reports = await get_request_json()
+
+        bulk_error = ingest.validate_bulk(reports)
+        if bulk_error:
+            return jsonify({
+                'status': 'error',
+                'message': bulk_error
+            }), 400
+
+        report_ids = []
+        errors = []
+        for index, report_data in enumerate(reports):
+            item_error = ingest.bulk_item_error(report_data)
+            if item_error:
+                errors.append({'index': index, 'message': item_error})
+                continue
+
+            report_ids.append(await store_report(report_data))
+
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(report_ids)}개의 리포트가 저장되었습니다.',
+            'report_ids': report_ids,
+            'errors': errors
+        }), 200
+
+    except ingest.RequestTooLarge as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        return server_error(e)
+
+@app.route('/api/reports/latest', methods=['GET'])
+async def get_latest_reports():
+    """
+    각 PC의 최신 리포트 조회
+
+    GET /api/reports/latest
+    """
+    try:
+        reports = await db.get_latest_reports()
+        return jsonify({
+            'status': 'success',
+            'data': reports,
+            'count': len(reports)
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/reports/summary', methods=['GET'])
+async def get_report_summaries():
+    """
+    각 PC의 최신 리포트 요약 조회 (대시보드 카드용, PST/메일 계정 목록 제외)
+
+    GET /api/reports/summary
+    """
+    try:
+        summaries = await db.get_report_summaries()
+        return jsonify({
+            'status': 'success',
+            'data': summaries,
+            'count': len(summaries)
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/reports/latest/<computer_name>', methods=['GET'])
+async def get_latest_report(computer_name):
+    """
+    특정 PC의 최신 리포트 전체 조회 (상세 화면용)
+
+    GET /api/reports/latest/<computer_name>
+    """
+    try:
+        report = await db.get_latest_report(computer_name)
+
+        if not report:
+            return jsonify({
+                'status': 'error',
+                'message': f'리포트가 없습니다: {computer_name}'
+            }), 404
+
+        return jsonify({
+            'status': 'success',
+            'data': report
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/reports/history/<computer_name>', methods=['GET'])
+async def get_pc_history(computer_name):
+    """
+    특정 PC의 히스토리 조회
+
+    GET /api/reports/history/<computer_name>?days=7
+    """
+    try:
+        days = request.args.get('days', default=7, type=int)
+        history = await db.get_pc_history(computer_name, days)
+
+        return jsonify({
+            'status': 'success',
+            'data': history,
+            'count': len(history)
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/search', methods=['GET'])
+async def search_pcs():
+    """
+    PC 검색 (컴퓨터 이름, 사용자 이름, 표시 이름, PST 경로, 이메일 계정)
+
+    GET /api/search?q=hong&limit=50
+    """
+    try:
+        query = request.args.get('q', default='', type=str).strip()
+        limit = request.args.get('limit', default=50, type=int)
+
+        if not query:
+            return jsonify({
+                'status': 'error',
+                'message': '검색어(q)가 필요합니다.'
+            }), 400
+
+        results = await db.search(query, max(1, min(limit, 500)))
+        return jsonify({
+            'status': 'success',
+            'data': results,
+            'count': len(results)
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/forecast', methods=['GET'])
+async def get_forecast():
+    """
+    드라이브/PST 용량 예측 (가득 찰 때까지 남은 일수)
+
+    GET /api/forecast?days=90&computer_name=<pc>
+    days: 이 일수 안에 가득 차는 항목만 반환 (0이면 증가 중인 항목 전부)
+    """
+    try:
+        days = request.args.get('days', default=90, type=int)
+        computer_name = request.args.get('computer_name', default=None, type=str)
+
+        forecasts = await db.get_forecasts(days if days > 0 else None, computer_name)
+        return jsonify({
+            'status': 'success',
+            'data': forecasts,
+            'count': len(forecasts)
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/export', methods=['GET'])
+async def export_data():
+    """
+    리포트 데이터 내보내기 (스트리밍)
+
+    GET /api/export?format=csv&table=reports&since=2025-01-01&until=2025-01-31&computer_name=PC1
+    format: csv, ndjson, parquet (pyarrow 설치 시)
+    table: reports (리포트당 1행), drives (드라이브당 1행), pst (PST 파일당 1행)
+    computer_name: 여러 번 지정 가능
+    """
+    try:
+        fmt = request.args.get('format', default='csv', type=str)
+        table = request.args.get('table', default='reports', type=str)
+        since = request.args.get('since', default=None, type=str)
+        until = request.args.get('until', default=None, type=str)
+        computer_names = request.args.getlist('computer_name')
+
+        if table not in export.EXPORT_TABLES or fmt not in export.EXPORT_FORMATS:
+            raise ValueError(f'지원하지 않는 형식 또는 내보내기 대상입니다: {fmt}, {table}')
+        if fmt == 'parquet' and not export.parquet_available():
+            raise ValueError('pyarrow가 설치되지 않아 Parquet 형식을 사용할 수 없습니다.')
+
+        def make_chunks():
+            return export.stream_export(db.db.iter_reports(since, until, computer_names), table, fmt)
+
+        filename = f"pc-monitoring-{table}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+        response = Response(db.iterate(make_chunks), mimetype=export.EXPORT_FORMATS[fmt], headers={
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        })
+        response.timeout = None  # 큰 내보내기도 끝까지 전송
+        return response
+
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/statistics', methods=['GET'])
+async def get_statistics():
+    """
+    전체 통계 조회
+
+    GET /api/statistics
+    """
+    try:
+        stats = await db.get_statistics()
+        return jsonify({
+            'status': 'success',
+            'data': stats
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/alerts', methods=['GET'])
+async def get_alerts():
+    """
+    경고 사항 조회
+
+    GET /api/alerts
+    """
+    try:
+        alerts = await db.get_alerts()
+        return jsonify({
+            'status': 'success',
+            'data': alerts,
+            'count': len(alerts)
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/cleanup', methods=['POST'])
+async def cleanup_old_data():
+    """
+    오래된 데이터 정리
+
+    POST /api/cleanup?days=30
+    """
+    try:
+        days = request.args.get('days', default=30, type=int)
+        deleted_count = await db.cleanup_old_reports(days)
+
+        return jsonify({
+            'status': 'success',
+            'message': f'{deleted_count}개의 오래된 리포트를 삭제했습니다.',
+            'deleted_count': deleted_count
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/user-mappings', methods=['GET'])
+async def get_user_mappings():
+    """
+    모든 사용자 이름 매핑 조회
+
+    GET /api/user-mappings
+    """
+    try:
+        mappings = await db.get_all_user_mappings()
+        return jsonify({
+            'status': 'success',
+            'data': mappings,
+            'count': len(mappings)
+        }), 200
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/user-mappings/<computer_name>', methods=['PUT'])
+async def update_user_mapping(computer_name):
+    """
+    사용자 이름 매핑 업데이트
+
+    PUT /api/user-mappings/<computer_name>
+    Body: {"windows_user": "...", "display_name": "..."}
+    """
+    try:
+        data = await request.get_json(silent=True)
+
+        if not data or 'display_name' not in data:
+            return jsonify({
+                'status': 'error',
+                'message': 'display_name이 필요합니다.'
+            }), 400
+
+        windows_user = data.get('windows_user', '')
+        display_name = data['display_name']
+
+        success = await db.set_display_name(computer_name, windows_user, display_name)
+
+        if success:
+            return jsonify({
+                'status': 'success',
+                'message': '사용자 이름이 업데이트되었습니다.'
+            }), 200
+        else:
+            return jsonify({
+                'status': 'error',
+                'message': '업데이트 실패'
+            }), 500
+
+    except Exception as e:
+        return server_error(e)
+
+@app.route('/api/archive-date/<computer_name>', methods=['PUT'])
+async def update_archive_date(computer_name):
+    """
+    아카이브 날짜 업데이트
+
+    PUT /api/archive-date/<computer_name>
+    Body: {"archive_date": "YYYY-MM-DD"}
+    """
+    try:
+        data = await request.get_json(silent=True)
+
+        if not data or 'archive_date' not in data:
+            return jsonify({
+                'status': 'error',
+                'message': 'archive_date가 필요합니다.'
+            }), 400
+
+        archive_date = data['archive_date']
+
+        try:
+            datetime.strptime(archive_date, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({
+                'status': 'error',
+                'message': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'
+            }), 400
+
+        success = await db.set_archive_date(computer_name, archive_date)
+
+        if success:
+            return jsonify({
+                'status': 'success',
+                'message': '아카이브 날짜가 업데이트되었습니다.'
+            }), 200
+        else:
+            return jsonify({
+                'status': 'error',
+                'message': '업데이트 실패'
+            }), 500
+
+    except Exception as e:
+        return server_error(e)
+
+# ==================== 메인 실행 ====================
+
+if __name__ == '__main__':
+    # 개발용 실행 (운영 환경에서는 hypercorn 사용)
+    app.run(host='0.0.0.0', port=5000)
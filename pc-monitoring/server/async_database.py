@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 데이터베이스 래퍼
+Database 클래스를 asyncio 환경(ASGI 서버)에서 이벤트 루프를 막지 않고 사용합니다.
+
+- 읽기: 크기가 제한된 스레드 풀에서 실행
+- 쓰기: SQLite는 쓰기 연결이 하나뿐이므로 전용 writer 태스크가 큐에서 하나씩 꺼내
+  단일 스레드에서 순서대로 실행
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from database import Database
+
+
+class AsyncDatabase:
+    def __init__(self, db: Database, max_readers: int = 8, max_pending_writes: int = 1000):
+        """
+        Args:
+            db: 실제 작업을 수행할 Database 인스턴스
+            max_readers: 동시에 실행할 수 있는 읽기 작업 수
+            max_pending_writes: writer 큐에 쌓일 수 있는 최대 쓰기 작업 수 (초과 시 대기)
+        """
+        self.db = db
+        self.max_pending_writes = max_pending_writes
+        self._read_executor = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix='db-read')
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-write')
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """writer 태스크 시작 (서버 시작 시 한 번 호출)"""
+        if self._writer_task is not None:
+            return
+        self._write_queue = asyncio.Queue(maxsize=self.max_pending_writes)
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def close(self):
+        """남은 쓰기 작업을 모두 처리한 뒤 writer 태스크, 스레드 풀, DB 연결 종료"""
+        if self._writer_task is not None:
+            await self._write_queue.put(None)
+            await self._writer_task
+            self._writer_task = None
+        self._read_executor.shutdown(wait=True)
+        self._write_executor.shutdown(wait=True)
+        self.db.close()
+
+    async def _writer_loop(self):
+        """쓰기 큐를 순서대로 처리하는 전용 writer 태스크"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._write_queue.get()
+            if job is None:
+                break
+
+            func, args, future = job
+            try:
+                result = await loop.run_in_executor(self._write_executor, func, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def _read(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_executor, func, *args)
+
+    async def _write(self, func, *args):
+        if self._writer_task is None:
+            raise RuntimeError('AsyncDatabase.start()가 호출되지 않았습니다.')
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((func, args, future))
+        return await future
+
+    async def iterate(self, make_iterator, *args):
+        """
+        동기 이터레이터(예: iter_reports + 내보내기 변환)를 전용 스레드에서 하나씩 꺼내는 비동기 제너레이터
+
+        SQLite 연결은 만든 스레드에서만 쓸 수 있으므로 스트림마다 스레드 하나를 사용합니다.
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-stream')
+        iterator = await loop.run_in_executor(executor, make_iterator, *args)
+        done = object()
+        try:
+            while True:
+                item = await loop.run_in_executor(executor, next, iterator, done)
+                if item is done:
+                    break
+                yield item
+        finally:
+            if hasattr(iterator, 'close'):
+                await loop.run_in_executor(executor, iterator.close)
+            executor.shutdown(wait=False)
+
+    # ==================== 쓰기 ====================
+
+    async def save_report(self, report_data: Dict) -> int:
+        return await self._write(self.db.save_report, report_data)
+
+    async def cleanup_old_reports(self, days: int = 30) -> int:
+        return await self._write(self.db.cleanup_old_reports, days)
+
+    async def set_display_name(self, computer_name: str, windows_user: str, display_name: str) -> bool:
+        return await self._write(self.db.set_display_name, computer_name, windows_user, display_name)
+
+    async def set_archive_date(self, computer_name: str, archive_date: str,
+                               windows_user: str = None, user_name: str = None,
+                               report_timestamp: Optional[str] = None) -> bool:
+        return await self._write(self.db.set_archive_date, computer_name, archive_date,
+                                 windows_user, user_name, report_timestamp)
+
+    # ==================== 읽기 ====================
+
+    async def get_latest_reports(self) -> List[Dict]:
+        return await self._read(self.db.get_latest_reports)
+
+    async def get_report_summaries(self) -> List[Dict]:
+        return await self._read(self.db.get_report_summaries)
+
+    async def get_latest_report(self, computer_name: str) -> Optional[Dict]:
+        return await self._read(self.db.get_latest_report, computer_name)
+
+    async def get_pc_history(self, computer_name: str, days: int = 7) -> List[Dict]:
+        return await self._read(self.db.get_pc_history, computer_name, days)
+
+    async def get_statistics(self) -> Dict:
+        return await self._read(self.db.get_statistics)
+
+    async def get_alerts(self) -> List[Dict]:
+        return await self._read(self.db.get_alerts)
+
+    async def get_all_user_mappings(self) -> List[Dict]:
+        return await self._read(self.db.get_all_user_mappings)
+
+    async def get_forecasts(self, horizon_days: Optional[float] = None,
+                            computer_name: Optional[str] = None) -> List[Dict]:
+        return await self._read(self.db.get_forecasts, horizon_days, computer_name)
+
+    async def search(self, query: str, limit: int = 50) -> List[Dict]:
+        return await self._read(self.db.search, query, limit)
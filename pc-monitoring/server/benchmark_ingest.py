@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+리포트 수신 벤치마크
+여러 클라이언트가 동시에 /api/report 로 전송할 때의 처리량과 지연 시간을 측정합니다.
+
+Flask 서버와 ASGI 서버를 각각 실행한 뒤 비교합니다:
+    python app.py                                          # :5000
+    hypercorn asgi_app:app --bind 0.0.0.0:5001 --workers 1
+
+    python benchmark_ingest.py --url http://localhost:5000/api/report \\
+                               --url http://localhost:5001/api/report \\
+                               --requests 2000 --concurrency 50
+
+두 서버가 같은 DB 파일을 쓰지 않도록 서로 다른 폴더에서 실행하세요.
+"""
+
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+def make_report(index: int) -> bytes:
+    """클라이언트가 보내는 것과 비슷한 크기의 리포트 생성"""
+    report = {
+        'computer_name': f'BENCH-PC-{index % 500:04d}',
+        'user_name': f'bench.user{index % 500}',
+        'windows_user': f'bench{index % 500}',
+        'ip_address': f'10.0.{index % 250}.{index % 200 + 1}',
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'drives': [
+            {'drive': 'C:', 'total_gb': 476.3, 'used_gb': 301.2, 'free_gb': 175.1, 'used_percent': 63.2},
+            {'drive': 'D:', 'total_gb': 931.5, 'used_gb': 120.4, 'free_gb': 811.1, 'used_percent': 12.9},
+        ],
+        'pst_files': [
+            {'name': 'Outlook.pst', 'path': 'C:\\Users\\bench\\Documents\\Outlook Files\\Outlook.pst',
+             'size_gb': 1.7, 'last_modified': '2025-01-15 09:00:00'},
+        ],
+        'total_pst_size_gb': 1.7,
+        'mail_info': {'total_emails': 5000, 'period_emails': 15, 'inbox_size_mb': 250,
+                      'last_archive_date': None, 'status': 'success'},
+        'active_email_accounts': [
+            {'display_name': 'Bench User', 'email_address': f'bench{index % 500}@example.com', 'account_type': 0},
+        ],
+        'last_archive_date': None,
+    }
+    return json.dumps(report).encode('utf-8')
+
+
+def send_one(url: str, body: bytes, timeout: float):
+    """리포트 1건 전송 - (성공 여부, 지연 시간 초) 반환"""
+    req = urllib.request.Request(url, data=body, method='POST',
+                                 headers={'Content-Type': 'application/json; charset=utf-8'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            ok = resp.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return ok, time.perf_counter() - start
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run(url: str, total: int, concurrency: int, timeout: float) -> dict:
+    bodies = [make_report(i) for i in range(total)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda body: send_one(url, body, timeout), bodies))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for ok, latency in results if ok)
+    errors = sum(1 for ok, _ in results if not ok)
+
+    return {
+        'url': url,
+        'requests': total,
+        'errors': errors,
+        'elapsed_s': elapsed,
+        'throughput_rps': (total - errors) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] * 1000) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동시 리포트 수신 벤치마크')
+    parser.add_argument('--url', action='append', required=True,
+                        help='리포트 수신 URL (여러 번 지정하면 순서대로 비교)')
+    parser.add_argument('--requests', type=int, default=1000, help='서버별 전송할 리포트 수')
+    parser.add_argument('--concurrency', type=int, default=50, help='동시 전송 수')
+    parser.add_argument('--timeout', type=float, default=30.0, help='요청 타임아웃 (초)')
+    args = parser.parse_args()
+
+    print(f"리포트 {args.requests}건, 동시성 {args.concurrency}")
+    print(f"{'URL':45} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'errors':>7}")
+
+    for url in args.url:
+        r = run(url, args.requests, args.concurrency, args.timeout)
+        print(f"{r['url']:45} {r['throughput_rps']:8.1f} {r['p50_ms']:8.1f} "
+              f"{r['p95_ms']:8.1f} {r['p99_ms']:8.1f} {r['max_ms']:8.1f} {r['errors']:7d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,18 +2,78 @@
 """
 데이터베이스 관리 모듈
 SQLite를 사용하여 PC 정보를 저장하고 조회합니다.
+
+읽기/쓰기 연결을 분리합니다.
+- 쓰기: 프로세스당 writer 연결 하나 (writing()), 트랜잭션은 짧게 유지
+- 읽기: query_only 연결 풀 (reading()), WAL 모드라 쓰기 중에도 마지막 커밋 기준 스냅샷을 바로 읽음
+- snapshot_max_staleness > 0 이면 대시보드 읽기는 backup API로 복사한 메모리 DB에서 처리
 """
 
 import sqlite3
 import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
+
+import forecast
+import migrations
+
+# 예측 경고를 낼 기준 (가득 찰 때까지 남은 일수)
+FORECAST_ALERT_DAYS = 30
+FORECAST_HIGH_DAYS = 7
+
+# 오래된 리포트 삭제 시 한 트랜잭션에서 지울 최대 행 수 (writer 잠금을 짧게 유지)
+CLEANUP_BATCH_SIZE = 2000
+
+# 다른 프로세스(워커, 백필 스레드)가 쓰기 잠금을 잡고 있을 때 기다리는 최대 시간 (초, migrations.connect와 같은 값)
+WRITE_TIMEOUT = 30
 
 class Database:
-    def __init__(self, db_path: str = "pc_monitoring.db"):
-        """데이터베이스 초기화"""
+    def __init__(self, db_path: str = "pc_monitoring.db", mapping_check_interval: float = 1.0,
+                 read_pool_size: int = 8, snapshot_max_staleness: float = 0.0):
+        """
+        데이터베이스 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+            mapping_check_interval: 다른 프로세스(워커)의 user_mappings 변경 여부를
+                                    확인하는 최소 간격 (초)
+            read_pool_size: 읽기 전용 연결 풀 크기 (초과 요청은 연결이 반환될 때까지 대기)
+            snapshot_max_staleness: 0이면 DB 파일을 직접 읽음 (항상 최신 커밋).
+                                    0보다 크면 대시보드 조회를 메모리 스냅샷에서 처리하고,
+                                    스냅샷이 이 시간(초)보다 오래되면 다시 복사
+        """
         self.db_path = db_path
+        self.mapping_check_interval = mapping_check_interval
+        self.read_pool_size = read_pool_size
+        self.snapshot_max_staleness = snapshot_max_staleness
+
+        # user_mappings 메모리 캐시 (computer_name -> 행 딕셔너리)
+        self._mapping_lock = threading.Lock()
+        self._mappings: Dict[str, Dict] = {}
+        self._mapping_version = None
+        self._mapping_checked_at = 0.0
+
+        # writer 연결 (프로세스 안에서 한 번에 하나의 쓰기 트랜잭션만)
+        self._write_lock = threading.RLock()
+        self._writer = None
+
+        # 읽기 연결 풀
+        self._read_pool = queue.LifoQueue()
+        self._read_pool_lock = threading.Lock()
+        self._read_created = 0
+
+        # 메모리 스냅샷 (snapshot_max_staleness > 0 일 때만 사용)
+        self._snapshot = None
+        self._snapshot_at = 0.0
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_refresh_lock = threading.Lock()
+
         self.init_database()
+        self._load_user_mappings()
 
     def get_connection(self):
         """데이터베이스 연결 생성"""
@@ -21,9 +81,129 @@ class Database:
         conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
         return conn
 
+    # ==================== 연결 관리 ====================
+
+    def _open_reader(self):
+        """읽기 전용 연결 생성 (풀/스트림 스레드 간에 넘겨 쓰므로 check_same_thread 해제)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    @contextmanager
+    def writing(self):
+        """
+        writer 연결 사용
+
+        블록이 정상 종료되면 커밋, 예외가 나면 롤백합니다.
+        같은 프로세스의 쓰기는 여기서 순서대로 처리되므로 트랜잭션 안에서 오래 머물지 않아야 합니다.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = sqlite3.connect(self.db_path, timeout=WRITE_TIMEOUT, check_same_thread=False)
+                self._writer.row_factory = sqlite3.Row
+                # WAL에서는 NORMAL로도 충돌 시 DB가 깨지지 않음 (마지막 커밋 일부만 유실 가능)
+                self._writer.execute('PRAGMA synchronous = NORMAL')
+
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    @contextmanager
+    def reading(self, live: bool = False):
+        """
+        읽기 연결 사용
+
+        Args:
+            live: True이면 스냅샷 설정과 관계없이 DB 파일을 직접 읽음
+                  (캐시 버전 확인처럼 최신 값이 필요한 경우)
+        """
+        if self.snapshot_max_staleness > 0 and not live:
+            self._ensure_snapshot()
+            # 메모리 스냅샷 연결은 하나뿐이므로 조회를 순서대로 처리
+            with self._snapshot_lock:
+                yield self._snapshot
+            return
+
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._read_pool_lock:
+                create = self._read_created < self.read_pool_size
+                if create:
+                    self._read_created += 1
+            conn = self._open_reader() if create else self._read_pool.get()
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._read_pool.put(conn)
+
+    def _ensure_snapshot(self):
+        """스냅샷이 없거나 snapshot_max_staleness보다 오래됐으면 다시 복사"""
+        if self._snapshot is not None and time.monotonic() - self._snapshot_at <= self.snapshot_max_staleness:
+            return
+
+        with self._snapshot_refresh_lock:
+            # 기다리는 동안 다른 스레드가 이미 갱신했을 수 있음
+            if self._snapshot is not None and time.monotonic() - self._snapshot_at <= self.snapshot_max_staleness:
+                return
+            self.refresh_snapshot()
+
+    def refresh_snapshot(self):
+        """
+        DB 파일 전체를 메모리 DB로 복사 (sqlite backup API)
+
+        복사는 읽기 연결에서 하므로 쓰기를 막지 않고, 기존 스냅샷은 복사가 끝난 뒤 교체합니다.
+        """
+        started_at = time.monotonic()
+        snapshot = sqlite3.connect(':memory:', check_same_thread=False)
+        snapshot.row_factory = sqlite3.Row
+
+        with self.reading(live=True) as source:
+            source.backup(snapshot)
+
+        with self._snapshot_lock:
+            old, self._snapshot = self._snapshot, snapshot
+            self._snapshot_at = started_at
+
+        if old is not None:
+            old.close()
+
+    def close(self):
+        """writer, 읽기 풀, 스냅샷 연결 닫기"""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._read_pool_lock:
+            self._read_created = 0
+
+        with self._snapshot_lock:
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+
+    # ==================== 스키마 ====================
+
     def init_database(self):
         """데이터베이스 테이블 생성"""
         conn = self.get_connection()
+
+        # WAL 모드: 읽기와 쓰기가 서로 막지 않음 (DB 파일에 영구 저장되는 설정)
+        conn.execute('PRAGMA journal_mode = WAL')
+
         cursor = conn.cursor()
 
         # PC 정보 테이블
@@ -55,6 +235,18 @@ class Database:
             )
         ''')
 
+        # 캐시 버전 테이블 (여러 워커 프로세스 간 캐시 무효화용)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cache_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO cache_versions (name, version)
+            VALUES ('user_mappings', 0)
+        ''')
+
         # 인덱스 생성 (검색 성능 향상)
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_computer_name
@@ -71,9 +263,51 @@ class Database:
             ON user_mappings(computer_name)
         ''')
 
+        # 용량 예측용 회귀 합계 (PC별 드라이브/PST 시계열 1행)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS forecast_stats (
+                computer_name TEXT NOT NULL,
+                kind TEXT NOT NULL,      -- 'drive' 또는 'pst'
+                label TEXT NOT NULL,     -- 드라이브 문자 또는 PST 경로
+                n INTEGER NOT NULL,
+                sum_t REAL NOT NULL,
+                sum_y REAL NOT NULL,
+                sum_tt REAL NOT NULL,
+                sum_ty REAL NOT NULL,
+                first_t REAL NOT NULL,
+                last_t REAL NOT NULL,
+                last_y REAL NOT NULL,
+                capacity REAL NOT NULL,
+                PRIMARY KEY (computer_name, kind, label)
+            )
+        ''')
+
+        # 검색 인덱스 (PC별 최신 리포트 1건, FTS5 rowid = search_docs.id)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_docs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                computer_name TEXT NOT NULL UNIQUE
+            )
+        ''')
+
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS pc_search USING fts5(
+                    computer_name, user_name, display_name, pst_paths, email_accounts,
+                    prefix = '2 3'
+                )
+            ''')
+            self.search_enabled = True
+        except sqlite3.OperationalError:
+            # FTS5가 포함되지 않은 SQLite 빌드
+            self.search_enabled = False
+
         conn.commit()
         conn.close()
 
+        # 버전별 마이그레이션 적용 (백필은 start_backfill_worker에서 백그라운드로 실행)
+        migrations.apply_schema_migrations(self.db_path)
+
     def save_report(self, report_data: Dict) -> int:
         """
         PC 리포트 저장
@@ -84,32 +318,41 @@ class Database:
         Returns:
             저장된 리포트 ID
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.writing() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            INSERT INTO pc_reports (
-                computer_name, user_name, ip_address, timestamp,
-                drives_info, pst_files, total_pst_size_gb, mail_info, active_email_accounts
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            report_data.get('computer_name'),
-            report_data.get('user_name'),
-            report_data.get('ip_address'),
-            report_data.get('timestamp'),
-            json.dumps(report_data.get('drives', []), ensure_ascii=False),
-            json.dumps(report_data.get('pst_files', []), ensure_ascii=False),
-            report_data.get('total_pst_size_gb', 0),
-            json.dumps(report_data.get('mail_info', {}), ensure_ascii=False),
-            json.dumps(report_data.get('active_email_accounts', []), ensure_ascii=False)
-        ))
-
-        report_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                INSERT INTO pc_reports (
+                    computer_name, user_name, ip_address, timestamp,
+                    drives_info, pst_files, total_pst_size_gb, mail_info, active_email_accounts
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                report_data.get('computer_name'),
+                report_data.get('user_name'),
+                report_data.get('ip_address'),
+                report_data.get('timestamp'),
+                json.dumps(report_data.get('drives', []), ensure_ascii=False),
+                json.dumps(report_data.get('pst_files', []), ensure_ascii=False),
+                report_data.get('total_pst_size_gb', 0),
+                json.dumps(report_data.get('mail_info', {}), ensure_ascii=False),
+                json.dumps(report_data.get('active_email_accounts', []), ensure_ascii=False)
+            ))
+
+            report_id = cursor.lastrowid
+            self._index_report(cursor, report_data)
+            self._update_forecast_stats(cursor, report_data)
 
         return report_id
 
+    def _has_newer_report(self, cursor, computer_name: str, timestamp: str) -> bool:
+        """이 시각보다 최근 리포트가 이미 저장되어 있는지 확인 (늦게 도착한 과거 리포트 판별)"""
+        cursor.execute('''
+            SELECT 1 FROM pc_reports
+            WHERE computer_name = ? AND timestamp > ?
+            LIMIT 1
+        ''', (computer_name, timestamp))
+        return cursor.fetchone() is not None
+
     def get_latest_reports(self) -> List[Dict]:
         """
         각 PC의 최신 리포트 조회
@@ -117,22 +360,17 @@ class Database:
         Returns:
             최신 리포트 리스트
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # 각 컴퓨터별로 가장 최근 리포트만 가져오기
-        cursor.execute('''
-            SELECT * FROM pc_reports
-            WHERE id IN (
-                SELECT MAX(id)
-                FROM pc_reports
-                GROUP BY computer_name
-            )
-            ORDER BY timestamp DESC
-        ''')
-
-        rows = cursor.fetchall()
-        conn.close()
+        with self.reading() as conn:
+            # 각 컴퓨터별로 가장 최근 리포트만 가져오기
+            rows = conn.execute('''
+                SELECT * FROM pc_reports
+                WHERE id IN (
+                    SELECT MAX(id)
+                    FROM pc_reports
+                    GROUP BY computer_name
+                )
+                ORDER BY timestamp DESC
+            ''').fetchall()
 
         reports = []
         for row in rows:
@@ -159,6 +397,88 @@ class Database:
 
         return reports
 
+    def get_report_summaries(self) -> List[Dict]:
+        """
+        각 PC 최신 리포트의 요약 조회 (대시보드 카드용)
+
+        PST 파일 목록, 이메일 계정 목록 등 상세 정보는 빼고 카드에 표시하는 값만 반환합니다.
+        상세 정보는 get_latest_report()로 PC별로 조회합니다.
+
+        Returns:
+            요약 리스트 (최근 리포트 순)
+        """
+        with self.reading() as conn:
+            rows = conn.execute('''
+                SELECT id, computer_name, user_name, ip_address, timestamp,
+                       drives_info, total_pst_size_gb, mail_info, active_email_accounts
+                FROM pc_reports
+                WHERE id IN (
+                    SELECT MAX(id)
+                    FROM pc_reports
+                    GROUP BY computer_name
+                )
+                ORDER BY timestamp DESC
+            ''').fetchall()
+
+        mappings = self._get_mappings()
+        summaries = []
+        for row in rows:
+            mail_info = json.loads(row['mail_info'] or '{}')
+            accounts = json.loads(row['active_email_accounts'] or '[]')
+            mapping = mappings.get(row['computer_name'])
+
+            summaries.append({
+                'id': row['id'],
+                'computer_name': row['computer_name'],
+                'user_name': row['user_name'],
+                'display_name': mapping['display_name'] if mapping else row['user_name'],
+                'ip_address': row['ip_address'],
+                'timestamp': row['timestamp'],
+                'drives': [
+                    {'drive': d.get('drive'), 'used_percent': d.get('used_percent'), 'free_gb': d.get('free_gb')}
+                    for d in json.loads(row['drives_info'] or '[]')
+                ],
+                'total_pst_size_gb': row['total_pst_size_gb'],
+                'period_emails': mail_info.get('period_emails') or mail_info.get('today_emails') or 0,
+                'primary_email': accounts[0].get('email_address') if accounts else None,
+                'last_archive_date': mapping['last_archive_date'] if mapping else None
+            })
+
+        return summaries
+
+    def get_latest_report(self, computer_name: str) -> Optional[Dict]:
+        """
+        특정 PC의 최신 리포트 전체 조회 (상세 화면용)
+
+        Args:
+            computer_name: 컴퓨터 이름
+
+        Returns:
+            최신 리포트 (없으면 None)
+        """
+        with self.reading() as conn:
+            row = conn.execute('''
+                SELECT * FROM pc_reports
+                WHERE computer_name = ?
+                ORDER BY id DESC
+                LIMIT 1
+            ''', (computer_name,)).fetchone()
+
+        if not row:
+            return None
+
+        report = dict(row)
+        report['drives'] = json.loads(report['drives_info'] or '[]')
+        report['pst_files'] = json.loads(report['pst_files'] or '[]')
+        report['mail_info'] = json.loads(report['mail_info'] or '{}')
+        report['active_email_accounts'] = json.loads(report.get('active_email_accounts') or '[]')
+        del report['drives_info']
+
+        report['display_name'] = self.get_display_name(computer_name) or report['user_name']
+        report['last_archive_date'] = self.get_archive_date(computer_name)
+
+        return report
+
     def get_pc_history(self, computer_name: str, days: int = 7) -> List[Dict]:
         """
         특정 PC의 히스토리 조회
@@ -170,20 +490,15 @@ class Database:
         Returns:
             리포트 히스토리 리스트
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-        cursor.execute('''
-            SELECT * FROM pc_reports
-            WHERE computer_name = ?
-            AND timestamp >= ?
-            ORDER BY timestamp DESC
-        ''', (computer_name, since_date))
-
-        rows = cursor.fetchall()
-        conn.close()
+        with self.reading() as conn:
+            rows = conn.execute('''
+                SELECT * FROM pc_reports
+                WHERE computer_name = ?
+                AND timestamp >= ?
+                ORDER BY timestamp DESC
+            ''', (computer_name, since_date)).fetchall()
 
         history = []
         for row in rows:
@@ -197,6 +512,65 @@ class Database:
 
         return history
 
+    def iter_reports(self, since: Optional[str] = None, until: Optional[str] = None,
+                     computer_names: Optional[List[str]] = None, chunk_size: int = 500) -> Iterator[Dict]:
+        """
+        리포트를 id 순서로 조금씩 읽어서 반환 (내보내기용)
+
+        전체 결과를 메모리에 올리지 않고 커서에서 chunk_size개씩 가져옵니다.
+        내보내기가 오래 걸려도 읽기 풀을 차지하지 않도록 전용 읽기 연결을 사용합니다.
+
+        Args:
+            since: 이 시각 이후 (YYYY-MM-DD 또는 YYYY-MM-DD HH:MM:SS)
+            until: 이 시각 이전 (날짜만 주면 그날 전체 포함)
+            computer_names: 특정 PC들만 조회
+            chunk_size: 한 번에 가져올 행 수
+
+        Returns:
+            리포트 이터레이터
+        """
+        conditions = []
+        params = []
+        if since:
+            conditions.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            conditions.append('timestamp <= ?')
+            params.append(until + ' 23:59:59' if len(until) == 10 else until)
+        if computer_names:
+            conditions.append(f"computer_name IN ({', '.join('?' * len(computer_names))})")
+            params.extend(computer_names)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        conn = self._open_reader()
+        try:
+            cursor = conn.execute(f'''
+                SELECT * FROM pc_reports
+                {where}
+                ORDER BY id
+            ''', params)
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+
+                mappings = self._get_mappings()
+                for row in rows:
+                    report = dict(row)
+                    report['drives'] = json.loads(report['drives_info'] or '[]')
+                    report['pst_files'] = json.loads(report['pst_files'] or '[]')
+                    report['mail_info'] = json.loads(report['mail_info'] or '{}')
+                    report['active_email_accounts'] = json.loads(report.get('active_email_accounts') or '[]')
+                    del report['drives_info']
+
+                    mapping = mappings.get(report['computer_name'])
+                    report['display_name'] = mapping['display_name'] if mapping else report['user_name']
+                    yield report
+        finally:
+            conn.close()
+
     def get_statistics(self) -> Dict:
         """
         전체 통계 조회
@@ -204,33 +578,32 @@ class Database:
         Returns:
             통계 데이터
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        today = datetime.now().strftime('%Y-%m-%d')
 
-        # 총 PC 수
-        cursor.execute('''
-            SELECT COUNT(DISTINCT computer_name) as total_pcs
-            FROM pc_reports
-        ''')
-        total_pcs = cursor.fetchone()['total_pcs']
+        with self.reading() as conn:
+            cursor = conn.cursor()
 
-        # 오늘 리포트 수
-        today = datetime.now().strftime('%Y-%m-%d')
-        cursor.execute('''
-            SELECT COUNT(*) as today_reports
-            FROM pc_reports
-            WHERE DATE(timestamp) = DATE(?)
-        ''', (today,))
-        today_reports = cursor.fetchone()['today_reports']
+            # 총 PC 수
+            cursor.execute('''
+                SELECT COUNT(DISTINCT computer_name) as total_pcs
+                FROM pc_reports
+            ''')
+            total_pcs = cursor.fetchone()['total_pcs']
 
-        # 최근 리포트 시간
-        cursor.execute('''
-            SELECT MAX(timestamp) as last_report_time
-            FROM pc_reports
-        ''')
-        last_report = cursor.fetchone()['last_report_time']
+            # 오늘 리포트 수
+            cursor.execute('''
+                SELECT COUNT(*) as today_reports
+                FROM pc_reports
+                WHERE DATE(timestamp) = DATE(?)
+            ''', (today,))
+            today_reports = cursor.fetchone()['today_reports']
 
-        conn.close()
+            # 최근 리포트 시간
+            cursor.execute('''
+                SELECT MAX(timestamp) as last_report_time
+                FROM pc_reports
+            ''')
+            last_report = cursor.fetchone()['last_report_time']
 
         return {
             'total_pcs': total_pcs,
@@ -300,6 +673,39 @@ class Database:
                 except:
                     pass
 
+        # 용량 예측 경고 (FORECAST_ALERT_DAYS일 안에 가득 참)
+        if forecast.is_available():
+            try:
+                forecasts = self.get_forecasts(horizon_days=FORECAST_ALERT_DAYS)
+            except Exception as e:
+                # 예측 실패가 기존 경고 조회까지 막지 않도록 함
+                print(f"Error computing forecast alerts: {e}")
+                forecasts = []
+
+            for item in forecasts:
+                days_left = item['days_until_full']
+                severity = 'high' if days_left <= FORECAST_HIGH_DAYS else 'medium'
+
+                if item['kind'] == 'drive':
+                    alerts.append({
+                        'type': 'storage_forecast',
+                        'severity': severity,
+                        'computer_name': item['computer_name'],
+                        'message': f"{item['label']} 드라이브 약 {int(days_left)}일 후 가득 참 예상 "
+                                   f"({item['predicted_full_date']}, 하루 {item['growth_gb_per_day']}GB 증가)",
+                        'timestamp': item['last_report']
+                    })
+                else:
+                    pst_name = item['label'].replace('\\', '/').split('/')[-1]
+                    alerts.append({
+                        'type': 'pst_forecast',
+                        'severity': severity,
+                        'computer_name': item['computer_name'],
+                        'message': f"PST 파일 {pst_name} 약 {int(days_left)}일 후 최대 크기({item['capacity_gb']}GB) 도달 예상 "
+                                   f"({item['predicted_full_date']})",
+                        'timestamp': item['last_report']
+                    })
+
         # 심각도 순으로 정렬
         severity_order = {'high': 0, 'medium': 1, 'low': 2}
         alerts.sort(key=lambda x: severity_order[x['severity']])
@@ -310,47 +716,292 @@ class Database:
         """
         오래된 리포트 삭제
 
+        CLEANUP_BATCH_SIZE행씩 나눠 커밋하므로 삭제 중에도 리포트 수신이 사이사이 처리됩니다.
+        예측 합계에서는 같은 트랜잭션에서 삭제한 리포트의 값만 빼므로 전체를 다시 계산하지 않습니다.
+
         Args:
             days: 보관할 일수
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
+        deleted_count = 0
+        while True:
+            with self.writing() as conn:
+                cursor = conn.cursor()
+                rows = cursor.execute('''
+                    SELECT id, computer_name, timestamp, drives_info, pst_files
+                    FROM pc_reports
+                    WHERE timestamp < ?
+                    LIMIT ?
+                ''', (cutoff_date, CLEANUP_BATCH_SIZE)).fetchall()
+
+                self._subtract_forecast_stats(cursor, rows)
+                cursor.executemany('DELETE FROM pc_reports WHERE id = ?', [(row['id'],) for row in rows])
+                self._trim_forecast_stats(cursor, {row['computer_name'] for row in rows})
+
+            deleted = len(rows)
+            deleted_count += deleted
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
+
+        # 리포트가 모두 삭제된 PC는 검색 인덱스에서도 제거
+        if self.search_enabled and deleted_count:
+            with self.writing() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT id FROM search_docs
+                    WHERE computer_name NOT IN (SELECT DISTINCT computer_name FROM pc_reports)
+                ''')
+                stale_ids = [(row['id'],) for row in cursor.fetchall()]
+                cursor.executemany('DELETE FROM pc_search WHERE rowid = ?', stale_ids)
+                cursor.executemany('DELETE FROM search_docs WHERE id = ?', stale_ids)
+
+        return deleted_count
+
+    # ==================== 용량 예측 ====================
+
+    def _update_forecast_stats(self, cursor, report_data: Dict):
+        """
+        리포트의 드라이브/PST 값을 회귀 합계에 누적 (save_report와 같은 트랜잭션에서 호출)
+
+        이 리포트보다 오래전에만 보인 시계열(삭제된 PST, 분리된 드라이브)은 제거합니다.
+        스풀에서 늦게 도착한 과거 리포트는 합계에만 더해지고 최신 값은 바꾸지 않습니다.
+        """
+        try:
+            t = forecast.to_days(report_data.get('timestamp') or '')
+        except ValueError:
+            return
+
+        computer_name = report_data.get('computer_name')
+        _add_forecast_series(cursor, computer_name, t, forecast.report_series(report_data))
+
         cursor.execute('''
-            DELETE FROM pc_reports
-            WHERE timestamp < ?
-        ''', (cutoff_date,))
+            DELETE FROM forecast_stats
+            WHERE computer_name = ? AND last_t < ?
+        ''', (computer_name, t))
 
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+    def _subtract_forecast_stats(self, cursor, rows: List):
+        """
+        삭제할 리포트의 값을 회귀 합계에서 뺌 (cleanup_old_reports의 한 덩어리 트랜잭션에서 삭제 전에 호출)
 
-        return deleted_count
+        합계에 들어간 적 없는 값은 빼지 않습니다.
+        - 시계열이 다시 시작되기 전(first_t 이전)의 값
+        - 예측 합계 백필이 아직 처리하지 않은 리포트 (삭제되면 백필 대상에서도 빠짐)
 
-    def get_display_name(self, computer_name: str) -> Optional[str]:
+        Args:
+            rows: 삭제할 리포트 (id, computer_name, timestamp, drives_info, pst_files)
         """
-        컴퓨터 이름으로 표시 이름 조회
+        pending = migrations.pending_backfill_range(cursor, migrations.FORECAST_STATS_BACKFILL)
+
+        params = []
+        for row in rows:
+            if pending and pending[0] < row['id'] <= pending[1]:
+                continue
+            try:
+                t = forecast.to_days(row['timestamp'])
+            except (TypeError, ValueError):
+                continue
+
+            for series in forecast.report_series(_report_values(row)):
+                y = series['y']
+                params.append((t, y, t * t, t * y, row['computer_name'], series['kind'], series['label'], t))
+
+        cursor.executemany('''
+            UPDATE forecast_stats
+            SET n = n - 1,
+                sum_t = sum_t - ?,
+                sum_y = sum_y - ?,
+                sum_tt = sum_tt - ?,
+                sum_ty = sum_ty - ?
+            WHERE computer_name = ? AND kind = ? AND label = ? AND first_t <= ?
+        ''', params)
+
+    def _trim_forecast_stats(self, cursor, computer_names):
+        """
+        리포트를 삭제한 PC의 시계열 정리 (같은 트랜잭션에서 삭제 후에 호출)
+
+        n이 0이 된 시계열은 제거하고, 남은 시계열의 first_t는 PC의 가장 오래된 남은 리포트 시각 이후로 당깁니다.
+        """
+        for computer_name in computer_names:
+            # idx_reports_computer_timestamp 사용
+            first_timestamp = cursor.execute('''
+                SELECT MIN(timestamp) FROM pc_reports WHERE computer_name = ?
+            ''', (computer_name,)).fetchone()[0]
+
+            if first_timestamp is None:
+                cursor.execute('DELETE FROM forecast_stats WHERE computer_name = ?', (computer_name,))
+                continue
+
+            cursor.execute('DELETE FROM forecast_stats WHERE computer_name = ? AND n <= 0', (computer_name,))
+            try:
+                first_t = forecast.to_days(first_timestamp)
+            except ValueError:
+                continue
+            cursor.execute('''
+                UPDATE forecast_stats SET first_t = MAX(first_t, ?)
+                WHERE computer_name = ?
+            ''', (first_t, computer_name))
+
+    def get_forecasts(self, horizon_days: Optional[float] = None, computer_name: Optional[str] = None) -> List[Dict]:
+        """
+        드라이브/PST 용량이 가득 찰 때까지 남은 일수 예측
 
         Args:
-            computer_name: 컴퓨터 이름
+            horizon_days: 이 일수 안에 가득 차는 항목만 반환 (None이면 증가 중인 항목 전부)
+            computer_name: 특정 PC만 조회
 
         Returns:
-            표시 이름 (없으면 None)
+            남은 일수 오름차순 예측 리스트
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        columns = ', '.join(('computer_name', 'kind', 'label') + forecast.STAT_COLUMNS)
 
-        cursor.execute('''
-            SELECT display_name FROM user_mappings
-            WHERE computer_name = ?
-        ''', (computer_name,))
+        with self.reading() as conn:
+            if computer_name:
+                rows = conn.execute(f'SELECT {columns} FROM forecast_stats WHERE computer_name = ?',
+                                    (computer_name,)).fetchall()
+            else:
+                rows = conn.execute(f'SELECT {columns} FROM forecast_stats').fetchall()
+
+        return forecast.compute_forecasts(rows, horizon_days=horizon_days)
+
+    # ==================== 검색 ====================
 
+    def _index_report(self, cursor, report_data: Dict):
+        """
+        리포트를 검색 인덱스에 반영 (save_report와 같은 트랜잭션에서 호출)
+
+        그 PC에 더 최근 리포트가 이미 있으면(스풀에서 늦게 도착한 과거 리포트) 인덱스를 바꾸지 않습니다.
+        """
+        if not self.search_enabled:
+            return
+
+        computer_name = report_data.get('computer_name')
+        timestamp = report_data.get('timestamp')
+        if timestamp and self._has_newer_report(cursor, computer_name, timestamp):
+            return
+
+        mapping = self._get_mappings().get(computer_name)
+        display_name = mapping['display_name'] if mapping else report_data.get('user_name')
+        index_report(cursor, report_data, display_name)
+
+    def search(self, query: str, limit: int = 50) -> List[Dict]:
+        """
+        PC 검색 (컴퓨터 이름, 사용자 이름, 표시 이름, PST 경로, 이메일 계정)
+
+        각 단어는 접두어로 검색되며 모든 단어가 포함된 PC만 관련도 순으로 반환합니다.
+
+        Args:
+            query: 검색어 (공백으로 구분)
+            limit: 최대 결과 수
+
+        Returns:
+            검색 결과 리스트
+        """
+        if not self.search_enabled:
+            raise RuntimeError('이 SQLite 빌드는 FTS5 검색을 지원하지 않습니다.')
+
+        # 사용자 입력은 FTS 문법으로 해석하지 않고 각 단어를 따옴표로 감싼 접두어 검색으로 변환
+        terms = [term.replace('"', '""') for term in query.split()]
+        if not terms:
+            return []
+        match = ' AND '.join(f'"{term}"*' for term in terms)
+
+        with self.reading() as conn:
+            # bm25 가중치: computer_name, user_name, display_name, pst_paths, email_accounts
+            rows = conn.execute('''
+                SELECT computer_name, user_name, display_name, pst_paths, email_accounts,
+                       bm25(pc_search, 10.0, 5.0, 5.0, 1.0, 3.0) AS rank
+                FROM pc_search
+                WHERE pc_search MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ''', (match, limit)).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            result['pst_paths'] = [p for p in result['pst_paths'].split('\n') if p]
+            result['email_accounts'] = [a for a in result['email_accounts'].split('\n') if a]
+            result['rank'] = round(-result['rank'], 4)
+            results.append(result)
+
+        return results
+
+    # ==================== 사용자 매핑 캐시 ====================
+
+    def _load_user_mappings(self):
+        """user_mappings 전체를 메모리 캐시로 다시 읽기"""
+        with self.reading(live=True) as conn:
+            # 버전과 행이 같은 시점의 값이 되도록 한 읽기 트랜잭션에서 조회
+            conn.execute('BEGIN')
+            version = conn.execute("SELECT version FROM cache_versions WHERE name = 'user_mappings'").fetchone()['version']
+            mappings = {row['computer_name']: dict(row) for row in conn.execute('SELECT * FROM user_mappings')}
+            conn.rollback()
+
+        with self._mapping_lock:
+            self._mappings = mappings
+            self._mapping_version = version
+            self._mapping_checked_at = time.monotonic()
+
+    def _get_mappings(self) -> Dict[str, Dict]:
+        """
+        캐시된 매핑 반환
+
+        mapping_check_interval마다 버전 카운터만 조회하고,
+        다른 프로세스가 변경한 경우에만 전체를 다시 읽습니다.
+        """
+        if time.monotonic() - self._mapping_checked_at >= self.mapping_check_interval:
+            with self.reading(live=True) as conn:
+                version = conn.execute("SELECT version FROM cache_versions WHERE name = 'user_mappings'").fetchone()['version']
+
+            if version != self._mapping_version:
+                self._load_user_mappings()
+            else:
+                self._mapping_checked_at = time.monotonic()
+
+        return self._mappings
+
+    def _write_through_mapping(self, cursor, computer_name: str):
+        """
+        매핑 변경 후 버전 카운터를 올리고 해당 행을 캐시에 반영 (커밋 전 같은 트랜잭션에서 호출)
+        """
+        cursor.execute('''
+            UPDATE cache_versions SET version = version + 1
+            WHERE name = 'user_mappings'
+        ''')
+        cursor.execute("SELECT version FROM cache_versions WHERE name = 'user_mappings'")
+        version = cursor.fetchone()['version']
+        cursor.execute('SELECT * FROM user_mappings WHERE computer_name = ?', (computer_name,))
         row = cursor.fetchone()
-        conn.close()
 
-        return row['display_name'] if row else None
+        if row and self.search_enabled:
+            cursor.execute('''
+                UPDATE pc_search SET display_name = ?
+                WHERE rowid = (SELECT id FROM search_docs WHERE computer_name = ?)
+            ''', (row['display_name'], computer_name))
+
+        with self._mapping_lock:
+            if row:
+                self._mappings[computer_name] = dict(row)
+            if self._mapping_version is not None and version == self._mapping_version + 1:
+                self._mapping_version = version
+            else:
+                # 그 사이 다른 프로세스도 변경함 - 다음 조회 때 전체 다시 읽기
+                self._mapping_version = None
+                self._mapping_checked_at = 0.0
+
+    def get_display_name(self, computer_name: str) -> Optional[str]:
+        """
+        컴퓨터 이름으로 표시 이름 조회
+
+        Args:
+            computer_name: 컴퓨터 이름
+
+        Returns:
+            표시 이름 (없으면 None)
+        """
+        mapping = self._get_mappings().get(computer_name)
+        return mapping['display_name'] if mapping else None
 
     def set_display_name(self, computer_name: str, windows_user: str, display_name: str) -> bool:
         """
@@ -364,70 +1015,82 @@ class Database:
         Returns:
             성공 여부
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         try:
-            cursor.execute('''
-                INSERT INTO user_mappings (computer_name, windows_user, display_name, updated_at)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(computer_name)
-                DO UPDATE SET
-                    display_name = excluded.display_name,
-                    updated_at = excluded.updated_at
-            ''', (computer_name, windows_user, display_name, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-
-            conn.commit()
-            conn.close()
+            with self.writing() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO user_mappings (computer_name, windows_user, display_name, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(computer_name)
+                    DO UPDATE SET
+                        display_name = excluded.display_name,
+                        updated_at = excluded.updated_at
+                ''', (computer_name, windows_user, display_name, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+                self._write_through_mapping(cursor, computer_name)
+
             return True
         except Exception as e:
             print(f"Error setting display name: {e}")
-            conn.close()
+            self._mapping_checked_at = 0.0
             return False
 
-    def set_archive_date(self, computer_name: str, archive_date: str, windows_user: str = None, user_name: str = None) -> bool:
+    def set_archive_date(self, computer_name: str, archive_date: str, windows_user: str = None, user_name: str = None,
+                         report_timestamp: Optional[str] = None) -> bool:
         """
         마지막 아카이브 날짜 설정/업데이트
 
+        날짜가 캐시된 값과 같으면 DB에 쓰지 않습니다.
+        리포트에서 온 값(report_timestamp 지정)은 그 PC에 더 최근 리포트가 이미 있으면 무시합니다.
+        (스풀에서 늦게 도착한 과거 리포트가 아카이브 날짜를 되돌리지 않도록)
+
         Args:
             computer_name: 컴퓨터 이름
             archive_date: 아카이브 날짜 (YYYY-MM-DD)
             windows_user: Windows 사용자 이름 (새 레코드 생성 시 필요)
             user_name: 표시 이름 (새 레코드 생성 시 필요)
+            report_timestamp: 아카이브 날짜를 보낸 리포트의 시각 (수동 변경이면 None)
 
         Returns:
             성공 여부
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        cached = self._get_mappings().get(computer_name)
+        if cached and cached.get('last_archive_date') == archive_date:
+            return True
 
         try:
-            # Check if record exists
-            cursor.execute('SELECT id FROM user_mappings WHERE computer_name = ?', (computer_name,))
-            exists = cursor.fetchone()
+            with self.writing() as conn:
+                cursor = conn.cursor()
+
+                if report_timestamp and self._has_newer_report(cursor, computer_name, report_timestamp):
+                    return True
+
+                # Check if record exists
+                cursor.execute('SELECT id FROM user_mappings WHERE computer_name = ?', (computer_name,))
+                exists = cursor.fetchone()
+
+                if exists:
+                    # Update existing record
+                    cursor.execute('''
+                        UPDATE user_mappings
+                        SET last_archive_date = ?, updated_at = ?
+                        WHERE computer_name = ?
+                    ''', (archive_date, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), computer_name))
+                else:
+                    # Insert new record - use provided values or defaults
+                    win_user = windows_user if windows_user else 'unknown'
+                    display = user_name if user_name else 'unknown'
+                    cursor.execute('''
+                        INSERT INTO user_mappings (computer_name, windows_user, display_name, last_archive_date, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (computer_name, win_user, display, archive_date, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+                self._write_through_mapping(cursor, computer_name)
 
-            if exists:
-                # Update existing record
-                cursor.execute('''
-                    UPDATE user_mappings
-                    SET last_archive_date = ?, updated_at = ?
-                    WHERE computer_name = ?
-                ''', (archive_date, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), computer_name))
-            else:
-                # Insert new record - use provided values or defaults
-                win_user = windows_user if windows_user else 'unknown'
-                display = user_name if user_name else 'unknown'
-                cursor.execute('''
-                    INSERT INTO user_mappings (computer_name, windows_user, display_name, last_archive_date, updated_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (computer_name, win_user, display, archive_date, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-
-            conn.commit()
-            conn.close()
             return True
         except Exception as e:
             print(f"Error setting archive date: {e}")
-            conn.close()
+            self._mapping_checked_at = 0.0
             return False
 
     def get_archive_date(self, computer_name: str) -> Optional[str]:
@@ -440,18 +1103,8 @@ class Database:
         Returns:
             아카이브 날짜 (없으면 None)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT last_archive_date FROM user_mappings
-            WHERE computer_name = ?
-        ''', (computer_name,))
-
-        row = cursor.fetchone()
-        conn.close()
-
-        return row['last_archive_date'] if row and row['last_archive_date'] else None
+        mapping = self._get_mappings().get(computer_name)
+        return mapping['last_archive_date'] if mapping and mapping['last_archive_date'] else None
 
     def get_all_user_mappings(self) -> List[Dict]:
         """
@@ -460,11 +1113,145 @@ class Database:
         Returns:
             매핑 리스트
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM user_mappings ORDER BY computer_name')
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [dict(row) for row in rows]
+        mappings = self._get_mappings()
+        return [dict(mappings[name]) for name in sorted(mappings)]
+
+
+# ==================== 리포트 반영 공통 (save_report, 마이그레이션 백필) ====================
+
+def _report_values(row) -> Dict:
+    """pc_reports 행의 JSON 컬럼을 report_series가 읽는 형태로 변환"""
+    return {
+        'drives': json.loads(row['drives_info'] or '[]'),
+        'pst_files': json.loads(row['pst_files'] or '[]')
+    }
+
+
+def _add_forecast_series(cursor, computer_name: str, t: float, series_list: List[Dict]):
+    """시각 t의 시계열 값들을 회귀 합계에 더함 (t가 마지막 측정보다 이전이면 최신 값은 유지)"""
+    cursor.executemany('''
+        INSERT INTO forecast_stats (
+            computer_name, kind, label, n, sum_t, sum_y, sum_tt, sum_ty,
+            first_t, last_t, last_y, capacity
+        ) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(computer_name, kind, label) DO UPDATE SET
+            n = n + 1,
+            sum_t = sum_t + excluded.sum_t,
+            sum_y = sum_y + excluded.sum_y,
+            sum_tt = sum_tt + excluded.sum_tt,
+            sum_ty = sum_ty + excluded.sum_ty,
+            first_t = MIN(first_t, excluded.first_t),
+            last_y = CASE WHEN excluded.last_t >= last_t THEN excluded.last_y ELSE last_y END,
+            capacity = CASE WHEN excluded.last_t >= last_t THEN excluded.capacity ELSE capacity END,
+            last_t = MAX(last_t, excluded.last_t)
+    ''', [(computer_name, series['kind'], series['label'],
+           t, series['y'], t * t, t * series['y'], t, t, series['y'], series['capacity'])
+          for series in series_list])
+
+
+def _table_exists(cursor, name: str) -> bool:
+    return cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def backfill_forecast_stats(cursor, ids: List[int]):
+    """
+    기존 리포트 한 덩어리를 회귀 합계에 더함 (migrations의 backfill_forecast_stats에서 호출)
+
+    PC별 최신 리포트에 있는 시계열만 더하므로 삭제된 PST나 분리된 드라이브는 되살아나지 않습니다.
+    """
+    if not _table_exists(cursor, 'forecast_stats'):
+        # 예측 테이블이 없는 DB의 dry run 복사본
+        return
+
+    placeholders = ', '.join('?' * len(ids))
+    rows = cursor.execute(f'''
+        SELECT computer_name, timestamp, drives_info, pst_files
+        FROM pc_reports
+        WHERE id IN ({placeholders})
+    ''', ids).fetchall()
+
+    latest_keys = {}
+    for row in rows:
+        try:
+            t = forecast.to_days(row['timestamp'])
+        except (TypeError, ValueError):
+            continue
+
+        computer_name = row['computer_name']
+        if computer_name not in latest_keys:
+            # idx_reports_computer_timestamp 사용
+            latest = cursor.execute('''
+                SELECT drives_info, pst_files FROM pc_reports
+                WHERE computer_name = ?
+                ORDER BY timestamp DESC
+                LIMIT 1
+            ''', (computer_name,)).fetchone()
+            latest_keys[computer_name] = {
+                (series['kind'], series['label']) for series in forecast.report_series(_report_values(latest))
+            }
+
+        keys = latest_keys[computer_name]
+        _add_forecast_series(cursor, computer_name, t, [
+            series for series in forecast.report_series(_report_values(row))
+            if (series['kind'], series['label']) in keys
+        ])
+
+
+def index_report(cursor, report_data: Dict, display_name: Optional[str]):
+    """리포트 한 건으로 그 PC의 검색 문서를 교체"""
+    computer_name = report_data.get('computer_name')
+    pst_paths = '\n'.join(
+        pst.get('path') or pst.get('name') or ''
+        for pst in report_data.get('pst_files') or []
+    )
+    email_accounts = '\n'.join(
+        f"{account.get('email_address') or ''} {account.get('display_name') or ''}".strip()
+        for account in report_data.get('active_email_accounts') or []
+    )
+
+    cursor.execute('INSERT OR IGNORE INTO search_docs (computer_name) VALUES (?)', (computer_name,))
+    cursor.execute('SELECT id FROM search_docs WHERE computer_name = ?', (computer_name,))
+    doc_id = cursor.fetchone()[0]
+
+    cursor.execute('DELETE FROM pc_search WHERE rowid = ?', (doc_id,))
+    cursor.execute('''
+        INSERT INTO pc_search (rowid, computer_name, user_name, display_name, pst_paths, email_accounts)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (doc_id, computer_name, report_data.get('user_name'), display_name, pst_paths, email_accounts))
+
+
+def backfill_search_index(cursor, ids: List[int]):
+    """
+    기존 리포트 한 덩어리에 나온 PC 중 검색 인덱스에 없는 PC를 최신 리포트로 색인
+    (migrations의 backfill_search_index에서 호출)
+
+    이미 색인된 PC는 save_report가 최신 리포트로 유지하고 있으므로 건너뜁니다.
+    """
+    if not _table_exists(cursor, 'pc_search'):
+        # FTS5가 없는 빌드이거나 검색 테이블이 없는 DB의 dry run 복사본
+        return
+
+    placeholders = ', '.join('?' * len(ids))
+    computer_names = [row[0] for row in cursor.execute(f'''
+        SELECT DISTINCT computer_name FROM pc_reports
+        WHERE id IN ({placeholders})
+          AND computer_name NOT IN (SELECT computer_name FROM search_docs)
+    ''', ids)]
+
+    for computer_name in computer_names:
+        # idx_reports_computer_timestamp 사용
+        latest = cursor.execute('''
+            SELECT r.computer_name, r.user_name, r.pst_files, r.active_email_accounts, m.display_name
+            FROM pc_reports r
+            LEFT JOIN user_mappings m ON m.computer_name = r.computer_name
+            WHERE r.computer_name = ?
+            ORDER BY r.timestamp DESC
+            LIMIT 1
+        ''', (computer_name,)).fetchone()
+
+        index_report(cursor, {
+            'computer_name': latest['computer_name'],
+            'user_name': latest['user_name'],
+            'pst_files': json.loads(latest['pst_files'] or '[]'),
+            'active_email_accounts': json.loads(latest['active_email_accounts'] or '[]')
+        }, latest['display_name'] or latest['user_name'])
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+데이터 내보내기 모듈
+리포트를 CSV / NDJSON / Parquet 형식으로 조금씩 변환해 스트리밍합니다.
+
+Database.iter_reports()가 DB에서 리포트를 나눠 읽고, 여기서는 일정 행 수마다
+변환된 바이트 덩어리를 내보내므로 내보내기 크기와 관계없이 메모리 사용량이 일정합니다.
+"""
+
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없으면 Parquet 형식만 비활성화
+    pa = None
+    pq = None
+
+# 형식별 Content-Type
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+# 내보내기 대상별 컬럼 (drives / pst 는 리포트 1건이 여러 행으로 펼쳐짐)
+EXPORT_TABLES = {
+    'reports': [
+        'report_id', 'computer_name', 'user_name', 'display_name', 'ip_address', 'timestamp',
+        'drive_count', 'total_pst_size_gb', 'pst_count', 'total_emails', 'period_emails',
+        'inbox_size_mb', 'mail_status', 'email_accounts'
+    ],
+    'drives': [
+        'report_id', 'computer_name', 'timestamp', 'drive',
+        'total_gb', 'used_gb', 'free_gb', 'used_percent'
+    ],
+    'pst': [
+        'report_id', 'computer_name', 'timestamp', 'name', 'path', 'size_gb', 'last_modified'
+    ]
+}
+
+# Parquet 컬럼 타입 (나머지는 문자열)
+_FLOAT_COLUMNS = {'total_pst_size_gb', 'inbox_size_mb', 'total_gb', 'used_gb', 'free_gb', 'used_percent', 'size_gb'}
+_INT_COLUMNS = {'report_id', 'drive_count', 'pst_count', 'total_emails', 'period_emails'}
+
+
+def parquet_available() -> bool:
+    """pyarrow 설치 여부"""
+    return pq is not None
+
+
+def flatten(reports: Iterable[Dict], table: str) -> Iterator[Dict]:
+    """리포트를 내보내기 대상(table)의 행으로 펼치기"""
+    for report in reports:
+        if table == 'reports':
+            mail_info = report.get('mail_info') or {}
+            accounts = report.get('active_email_accounts') or []
+            yield {
+                'report_id': report['id'],
+                'computer_name': report['computer_name'],
+                'user_name': report['user_name'],
+                'display_name': report.get('display_name') or report['user_name'],
+                'ip_address': report.get('ip_address'),
+                'timestamp': report['timestamp'],
+                'drive_count': len(report.get('drives') or []),
+                'total_pst_size_gb': report.get('total_pst_size_gb'),
+                'pst_count': len(report.get('pst_files') or []),
+                'total_emails': mail_info.get('total_emails'),
+                'period_emails': mail_info.get('period_emails'),
+                'inbox_size_mb': mail_info.get('inbox_size_mb'),
+                'mail_status': mail_info.get('status'),
+                'email_accounts': ';'.join(a.get('email_address') or '' for a in accounts)
+            }
+        elif table == 'drives':
+            for drive in report.get('drives') or []:
+                yield {
+                    'report_id': report['id'],
+                    'computer_name': report['computer_name'],
+                    'timestamp': report['timestamp'],
+                    'drive': drive.get('drive'),
+                    'total_gb': drive.get('total_gb'),
+                    'used_gb': drive.get('used_gb'),
+                    'free_gb': drive.get('free_gb'),
+                    'used_percent': drive.get('used_percent')
+                }
+        elif table == 'pst':
+            for pst in report.get('pst_files') or []:
+                yield {
+                    'report_id': report['id'],
+                    'computer_name': report['computer_name'],
+                    'timestamp': report['timestamp'],
+                    'name': pst.get('name'),
+                    'path': pst.get('path'),
+                    'size_gb': pst.get('size_gb'),
+                    'last_modified': pst.get('last_modified')
+                }
+
+
+def _chunks(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _stream_csv(rows: Iterator[Dict], columns: List[str], chunk_rows: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+
+    # Excel에서 한글이 깨지지 않도록 BOM 포함
+    buffer.write('\ufeff')
+    writer.writeheader()
+
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _stream_ndjson(rows: Iterator[Dict], chunk_rows: int) -> Iterator[bytes]:
+    for chunk in _chunks(rows, chunk_rows):
+        yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in chunk).encode('utf-8')
+
+
+class _DrainableBuffer(io.RawIOBase):
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 꺼낼 때마다 비우는 출력 버퍼"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _stream_parquet(rows: Iterator[Dict], columns: List[str], chunk_rows: int) -> Iterator[bytes]:
+    schema = pa.schema([
+        (name, pa.float64() if name in _FLOAT_COLUMNS else pa.int64() if name in _INT_COLUMNS else pa.string())
+        for name in columns
+    ])
+
+    sink = _DrainableBuffer()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # 덩어리마다 row group 하나씩 기록
+        for chunk in _chunks(rows, chunk_rows):
+            batch = pa.Table.from_pylist(chunk, schema=schema)
+            writer.write_table(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def stream_export(reports: Iterable[Dict], table: str = 'reports', fmt: str = 'csv',
+                  chunk_rows: int = 1000) -> Iterator[bytes]:
+    """
+    리포트를 지정한 형식의 바이트 덩어리로 변환
+
+    Args:
+        reports: 리포트 이터레이터 (Database.iter_reports)
+        table: 'reports', 'drives', 'pst'
+        fmt: 'csv', 'ndjson', 'parquet'
+        chunk_rows: 덩어리 하나에 담을 행 수
+
+    Returns:
+        바이트 덩어리 이터레이터
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f'지원하지 않는 내보내기 대상입니다: {table}')
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'지원하지 않는 형식입니다: {fmt}')
+    if fmt == 'parquet' and not parquet_available():
+        raise ValueError('pyarrow가 설치되지 않아 Parquet 형식을 사용할 수 없습니다.')
+
+    rows = flatten(reports, table)
+    columns = EXPORT_TABLES[table]
+
+    if fmt == 'csv':
+        return _stream_csv(rows, columns, chunk_rows)
+    if fmt == 'ndjson':
+        return _stream_ndjson(rows, chunk_rows)
+    return _stream_parquet(rows, columns, chunk_rows)
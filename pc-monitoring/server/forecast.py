@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+스토리지 용량 예측 모듈
+드라이브 사용량과 PST 파일 크기의 증가 추세를 선형 회귀로 구해 가득 찰 때까지 남은 일수를 예측합니다.
+
+회귀에 필요한 합계(n, Σt, Σy, Σt², Σty)는 리포트가 들어올 때마다 forecast_stats 테이블에
+누적되므로(database.py), 여기서는 전체 시계열의 기울기를 NumPy로 한 번에 계산합니다.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 예측 기능만 비활성화
+    np = None
+
+# 시간 축 기준점 (t = 기준점으로부터 지난 일수)
+FORECAST_EPOCH = datetime(2020, 1, 1)
+
+# Outlook(2010 이상) Unicode PST 기본 최대 크기
+PST_LIMIT_GB = 50.0
+
+# 추세를 계산하기 위한 최소 데이터 포인트 수와 최소 기간(일)
+MIN_POINTS = 3
+MIN_SPAN_DAYS = 1.0
+
+# 이보다 느리게 증가하면 (부동소수점 오차 수준) 증가하지 않는 것으로 봄 (GB/일, 약 1MB/일)
+MIN_GROWTH_GB_PER_DAY = 0.001
+
+# 예측 남은 일수 상한 (약 100년, 날짜 변환 범위를 넘지 않도록)
+MAX_FORECAST_DAYS = 36500.0
+
+# forecast_stats에서 읽는 숫자 컬럼 순서
+STAT_COLUMNS = ('n', 'sum_t', 'sum_y', 'sum_tt', 'sum_ty', 'first_t', 'last_t', 'last_y', 'capacity')
+
+
+def is_available() -> bool:
+    """numpy 설치 여부"""
+    return np is not None
+
+
+def to_days(timestamp: str) -> float:
+    """리포트 타임스탬프(YYYY-MM-DD HH:MM:SS)를 기준점으로부터의 일수로 변환"""
+    return (datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S') - FORECAST_EPOCH).total_seconds() / 86400
+
+
+def report_series(report_data: Dict) -> List[Dict]:
+    """
+    리포트에서 예측 대상 시계열 값 추출
+
+    Returns:
+        [{'kind', 'label', 'y', 'capacity'}, ...]
+        - drive: 드라이브별 사용량(GB), 용량 = 전체 크기
+        - pst: PST 파일별 크기(GB), 용량 = PST_LIMIT_GB
+    """
+    series = []
+    for drive in report_data.get('drives') or []:
+        if drive.get('drive') and drive.get('total_gb'):
+            series.append({
+                'kind': 'drive',
+                'label': drive['drive'],
+                'y': float(drive.get('used_gb') or 0),
+                'capacity': float(drive['total_gb'])
+            })
+    for pst in report_data.get('pst_files') or []:
+        label = pst.get('path') or pst.get('name')
+        if label:
+            series.append({
+                'kind': 'pst',
+                'label': label,
+                'y': float(pst.get('size_gb') or 0),
+                'capacity': PST_LIMIT_GB
+            })
+    return series
+
+
+def compute_forecasts(rows: List, now: Optional[datetime] = None,
+                      horizon_days: Optional[float] = None) -> List[Dict]:
+    """
+    forecast_stats 행 전체에 대해 기울기와 가득 찰 때까지 남은 일수를 한 번에 계산
+
+    Args:
+        rows: (computer_name, kind, label, *STAT_COLUMNS) 행 리스트
+        now: 기준 시각 (기본: 현재)
+        horizon_days: 이 일수 안에 가득 차는 시계열만 반환 (None이면 증가 중인 시계열 전부)
+
+    Returns:
+        남은 일수 오름차순으로 정렬된 예측 리스트
+    """
+    if np is None:
+        raise RuntimeError('numpy가 설치되지 않아 예측 기능을 사용할 수 없습니다.')
+    if not rows:
+        return []
+
+    stats = np.array([tuple(row[3:]) for row in rows], dtype=np.float64)
+    n, st, sy, stt, sty, first_t, last_t, last_y, capacity = stats.T
+
+    # 기준점에서 수천 일 떨어진 t를 그대로 쓰면 상쇄 오차가 커지므로 첫 측정 시각(c) 기준으로 이동
+    # Σ(t-c) = Σt - nc, Σ(t-c)² = Σt² - 2cΣt + nc², Σ(t-c)y = Σty - cΣy
+    c = first_t
+    st_c = st - n * c
+    stt_c = stt - 2 * c * st + n * c * c
+    sty_c = sty - c * sy
+
+    # 최소자승 기울기: (nΣty - ΣtΣy) / (nΣt² - (Σt)²)
+    denom = n * stt_c - st_c * st_c
+    valid = (n >= MIN_POINTS) & (last_t - first_t >= MIN_SPAN_DAYS) & (denom > 0)
+    slope = np.zeros_like(n)
+    np.divide(n * sty_c - st_c * sy, denom, out=slope, where=valid)
+
+    # 마지막 측정값 이후 증가 추세가 계속된다고 가정
+    now_t = (((now or datetime.now()) - FORECAST_EPOCH).total_seconds() / 86400)
+    growing = valid & (slope >= MIN_GROWTH_GB_PER_DAY)
+    days_until_full = np.full_like(n, MAX_FORECAST_DAYS)
+    np.divide(capacity - last_y, slope, out=days_until_full, where=growing)
+    days_until_full = np.clip(days_until_full - (now_t - last_t), 0.0, MAX_FORECAST_DAYS)
+
+    selected = growing
+    if horizon_days is not None:
+        selected = selected & (days_until_full <= horizon_days)
+
+    order = np.flatnonzero(selected)
+    if order.size == 0:
+        return []
+    order = order[np.argsort(days_until_full[order], kind='stable')]
+
+    # 날짜 문자열도 datetime64로 한 번에 변환
+    epoch = np.datetime64(FORECAST_EPOCH, 's')
+    full_dates = (epoch + ((now_t + days_until_full[order]) * 86400).astype('timedelta64[s]')).astype('datetime64[D]').astype(str)
+    last_reports = np.char.replace((epoch + (last_t[order] * 86400).round().astype('timedelta64[s]')).astype(str), 'T', ' ')
+
+    forecasts = []
+    for j, i in enumerate(order.tolist()):
+        row = rows[i]
+        forecasts.append({
+            'computer_name': row[0],
+            'kind': row[1],
+            'label': row[2],
+            'current_gb': round(float(last_y[i]), 2),
+            'capacity_gb': round(float(capacity[i]), 2),
+            'growth_gb_per_day': round(float(slope[i]), 4),
+            'days_until_full': round(float(days_until_full[i]), 1),
+            'predicted_full_date': str(full_dates[j]),
+            'points': int(n[i]),
+            'last_report': str(last_reports[j])
+        })
+
+    return forecasts
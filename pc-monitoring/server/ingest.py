@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+리포트 수신 공통 모듈
+app.py(Flask)와 asgi_app.py(Quart)가 같은 규칙으로 요청 본문을 해석하고 리포트를 검증하도록
+프레임워크에 의존하지 않는 헬퍼를 모아 둡니다.
+"""
+
+import gzip
+import io
+import json
+from typing import Optional
+
+# 일괄 수신 시 한 번에 받을 수 있는 최대 리포트 수
+MAX_BULK_REPORTS = 100
+
+# 요청 본문 최대 크기 (gzip이면 압축 해제 후 기준, 압축 폭탄 방지)
+MAX_REQUEST_BODY_BYTES = 10 * 1024 * 1024
+
+# 리포트 필수 필드
+REQUIRED_FIELDS = ['computer_name', 'user_name', 'timestamp']
+
+
+class RequestTooLarge(Exception):
+    """요청 본문이 MAX_REQUEST_BODY_BYTES를 넘음 (413으로 응답)"""
+
+    def __init__(self):
+        super().__init__(f'요청 본문이 너무 큽니다 (최대 {MAX_REQUEST_BODY_BYTES // (1024 * 1024)}MB).')
+
+
+# ==================== 본문 해석 ====================
+
+def check_body_size(size: Optional[int]):
+    """본문 크기(바이트)가 한도를 넘으면 RequestTooLarge 발생 (None이면 통과)"""
+    if (size or 0) > MAX_REQUEST_BODY_BYTES:
+        raise RequestTooLarge()
+
+
+def parse_gzip_json(data: bytes):
+    """
+    gzip으로 압축된 본문을 풀어서 JSON으로 파싱
+
+    한도 + 1바이트까지만 풀어서 초과 여부를 확인하므로 전체를 메모리에 풀지 않습니다.
+
+    Args:
+        data: 압축된 요청 본문
+
+    Returns:
+        파싱된 JSON (압축이 깨졌거나 JSON이 아니면 None)
+    """
+    try:
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as f:
+            body = f.read(MAX_REQUEST_BODY_BYTES + 1)
+    except (OSError, EOFError):
+        return None
+
+    check_body_size(len(body))
+
+    try:
+        return json.loads(body.decode('utf-8-sig'))
+    except ValueError:
+        return None
+
+
+# ==================== 리포트 검증 ====================
+
+def validate_report(report_data):
+    """필수 필드 검증 - 누락된 첫 번째 필드 이름 반환 (없으면 None)"""
+    for field in REQUIRED_FIELDS:
+        if field not in report_data:
+            return field
+    return None
+
+
+def validate_bulk(reports) -> Optional[str]:
+    """일괄 수신 본문 검증 - 오류 메시지 반환 (문제 없으면 None)"""
+    if not reports or not isinstance(reports, list):
+        return '리포트 배열이 필요합니다.'
+    if len(reports) > MAX_BULK_REPORTS:
+        return f'한 번에 최대 {MAX_BULK_REPORTS}개까지 전송할 수 있습니다.'
+    return None
+
+
+def bulk_item_error(report_data) -> Optional[str]:
+    """일괄 수신의 리포트 한 건 검증 - 오류 메시지 반환 (저장 가능하면 None)"""
+    if not isinstance(report_data, dict):
+        return '잘못된 리포트 형식입니다.'
+    missing_field = validate_report(report_data)
+    if missing_field:
+        return f'필수 필드가 누락되었습니다: {missing_field}'
+    return None
+
+
+def normalize_archive_date(archive_date: str) -> str:
+    """리포트의 last_archive_date('YYYY-MM-DD HH:MM:SS')에서 날짜(YYYY-MM-DD)만 추출"""
+    return archive_date.split(' ')[0]
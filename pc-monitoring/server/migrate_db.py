@@ -1,70 +1,87 @@
 # -*- coding: utf-8 -*-
 """
 Database Migration Script
-Add active_email_accounts column to existing database
+마이그레이션은 서버 시작 시 자동으로 적용됩니다 (migrations.py).
+이 스크립트는 상태 확인, dry run, 서버를 띄우지 않고 수동 적용할 때 사용합니다.
+
+Usage:
+    python migrate_db.py                  # 스키마 변경 + 백필을 끝까지 실행
+    python migrate_db.py --status         # 마이그레이션별 상태
+    python migrate_db.py --dry-run        # 실행 계획과 예상 시간 (변경 없음)
+    python migrate_db.py --db other.db    # DB 파일 지정 (기본: pc_monitoring.db)
 """
 
-import sqlite3
-
-db_path = "pc_monitoring.db"
-
-print("Migrating database...")
-
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
-
-try:
-    # Check if active_email_accounts column exists
-    cursor.execute("PRAGMA table_info(pc_reports)")
-    columns = [col[1] for col in cursor.fetchall()]
-
-    if 'active_email_accounts' not in columns:
-        print("Adding active_email_accounts column...")
-        cursor.execute('''
-            ALTER TABLE pc_reports
-            ADD COLUMN active_email_accounts TEXT
-        ''')
-        print("[OK] Column added successfully!")
-    else:
-        print("active_email_accounts column already exists")
-
-    # Create user_mappings table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_mappings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            computer_name TEXT NOT NULL UNIQUE,
-            windows_user TEXT NOT NULL,
-            display_name TEXT NOT NULL,
-            last_archive_date TEXT,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    print("[OK] user_mappings table created/verified")
-
-    # Add last_archive_date column if it doesn't exist
-    cursor.execute("PRAGMA table_info(user_mappings)")
-    mapping_columns = [col[1] for col in cursor.fetchall()]
-
-    if 'last_archive_date' not in mapping_columns:
-        print("Adding last_archive_date column to user_mappings...")
-        cursor.execute('''
-            ALTER TABLE user_mappings
-            ADD COLUMN last_archive_date TEXT
-        ''')
-        print("[OK] last_archive_date column added!")
-
-    # Create index
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_mapping_computer
-        ON user_mappings(computer_name)
-    ''')
-    print("[OK] Index created")
-
-    conn.commit()
+import argparse
+import os
+import sys
+
+import migrations
+from database import Database
+
+
+def print_status(db_path):
+    for item in migrations.get_status(db_path):
+        line = f"  {item['version']:04d}_{item['name']:40} {item['status']:9}"
+        if item['status'] == 'backfill':
+            line += f" ({item['rows_done']} rows)"
+        elif item['finished_at']:
+            line += f" {item['finished_at']}"
+        print(line)
+
+
+def print_dry_run(db_path):
+    plans = migrations.dry_run(db_path)
+    if not plans:
+        print("[OK] 적용할 마이그레이션이 없습니다.")
+        return
+
+    total = 0.0
+    for plan in plans:
+        print(f"\n{plan['version']:04d}_{plan['name']} ({plan['status']})")
+        for statement in plan['statements']:
+            print(f"  SQL : {statement}")
+        for detail in plan['query_plan']:
+            print(f"  PLAN: {detail}")
+        if plan['query_plan']:
+            print(f"  백필 대상: {plan['rows']} rows")
+        print(f"  예상 시간: {plan['estimated_seconds']:.2f}s")
+        total += plan['estimated_seconds']
+
+    print(f"\n총 예상 시간: {total:.2f}s (임시 복사본에서 측정, 원본 DB는 변경 없음)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PC 모니터링 DB 마이그레이션')
+    parser.add_argument('--db', default='pc_monitoring.db', help='SQLite DB 파일 경로')
+    parser.add_argument('--status', action='store_true', help='마이그레이션 상태 출력')
+    parser.add_argument('--dry-run', action='store_true', help='실행 계획과 예상 시간만 출력')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"[ERROR] DB 파일이 없습니다: {args.db}")
+        sys.exit(1)
+
+    if args.status:
+        print_status(args.db)
+        return
+
+    if args.dry_run:
+        print_dry_run(args.db)
+        return
+
+    print("Migrating database...")
+    try:
+        # 테이블 생성 + 스키마 마이그레이션
+        Database(args.db)
+        # 백필을 끝까지 실행 (중단되면 다음 실행 때 이어서 진행)
+        migrations.run_backfills(args.db)
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        sys.exit(1)
+
+    print_status(args.db)
     print("\n[SUCCESS] Migration completed successfully!")
 
-except Exception as e:
-    print(f"[ERROR] Migration failed: {e}")
-    conn.rollback()
-finally:
-    conn.close()
+
+if __name__ == '__main__':
+    main()
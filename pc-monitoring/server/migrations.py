@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+데이터베이스 마이그레이션 모듈
+버전이 붙은 마이그레이션을 schema_migrations 테이블에 기록하며 한 번씩만 적용합니다.
+
+- 스키마 변경(DDL): 서버 시작 시 Database 초기화 과정에서 바로 적용
+- 백필(데이터 채우기): id 순서로 chunk_size개씩 짧은 트랜잭션으로 처리하고 매번 진행 위치를 저장
+  서버가 리포트를 받는 중에도 백그라운드 스레드에서 실행되며, 중단되면 저장된 위치부터 다시 시작
+
+새 마이그레이션은 MIGRATIONS 끝에 다음 버전 번호로 추가합니다.
+백필은 이후 마이그레이션과 독립적이어야 합니다 (백필이 끝나기 전에 다음 DDL이 적용될 수 있음).
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Backfill:
+    def __init__(self, table: str, where: str, update: Callable, chunk_size: int = 1000, pause: float = 0.05,
+                 snapshot: bool = False):
+        """
+        Args:
+            table: 대상 테이블 (INTEGER PRIMARY KEY id 필요)
+            where: 백필이 필요한 행 조건 (SQL)
+            update: update(cursor, ids) - 한 덩어리의 id 목록을 처리
+            chunk_size: 트랜잭션 하나에서 처리할 행 수
+            pause: 덩어리 사이 대기 시간 (초) - 그 사이 리포트 수신 쓰기가 끼어들 수 있음
+            snapshot: True이면 마이그레이션 적용 시점에 있던 행(id <= until_id)만 처리
+                      (이후 저장되는 행은 저장할 때 직접 반영되므로 두 번 처리하지 않도록)
+        """
+        self.table = table
+        self.where = where
+        self.update = update
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.snapshot = snapshot
+
+    def _range_sql(self) -> str:
+        return 'id > ? AND id <= ?' if self.snapshot else 'id > ?'
+
+    def range_args(self, checkpoint: int, until_id: Optional[int]) -> tuple:
+        return (checkpoint, until_id) if self.snapshot else (checkpoint,)
+
+    def select_sql(self) -> str:
+        return (f'SELECT id FROM {self.table} '
+                f'WHERE {self._range_sql()} AND ({self.where}) ORDER BY id LIMIT ?')
+
+    def count_sql(self) -> str:
+        return f'SELECT COUNT(*) FROM {self.table} WHERE {self._range_sql()} AND ({self.where})'
+
+
+class Migration:
+    def __init__(self, version: int, name: str, plan: Callable = None, backfill: Backfill = None):
+        """
+        Args:
+            version: 마이그레이션 번호 (오름차순으로 적용)
+            name: 이름
+            plan: plan(cursor) -> 실행할 SQL 문 리스트 (현재 스키마를 보고 결정 가능)
+            backfill: 스키마 변경 후 실행할 백필 (선택)
+        """
+        self.version = version
+        self.name = name
+        self.plan = plan or (lambda cursor: [])
+        self.backfill = backfill
+
+
+# ==================== 마이그레이션 목록 ====================
+
+def _columns(cursor, table: str) -> List[str]:
+    cursor.execute(f'PRAGMA table_info({table})')
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _plan_legacy_columns(cursor) -> List[str]:
+    """기존 migrate_db.py가 하던 작업: 이전 버전 DB에 없는 컬럼/테이블 추가"""
+    statements = []
+    if 'active_email_accounts' not in _columns(cursor, 'pc_reports'):
+        statements.append('ALTER TABLE pc_reports ADD COLUMN active_email_accounts TEXT')
+
+    mapping_columns = _columns(cursor, 'user_mappings')
+    if not mapping_columns:
+        statements.append('''
+            CREATE TABLE user_mappings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                computer_name TEXT NOT NULL UNIQUE,
+                windows_user TEXT NOT NULL,
+                display_name TEXT NOT NULL,
+                last_archive_date TEXT,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    elif 'last_archive_date' not in mapping_columns:
+        statements.append('ALTER TABLE user_mappings ADD COLUMN last_archive_date TEXT')
+
+    statements.append('CREATE INDEX IF NOT EXISTS idx_mapping_computer ON user_mappings(computer_name)')
+    return statements
+
+
+def _fill_empty_email_accounts(cursor, ids: List[int]):
+    cursor.executemany(
+        "UPDATE pc_reports SET active_email_accounts = '[]' WHERE id = ? AND active_email_accounts IS NULL",
+        [(report_id,) for report_id in ids]
+    )
+
+
+def _plan_reset_forecast_stats(cursor) -> List[str]:
+    """기존 합계는 비우고 백필로 다시 채움 (적용 이후 저장되는 리포트는 save_report가 직접 반영)"""
+    if not _columns(cursor, 'forecast_stats'):
+        return []
+    return ['DELETE FROM forecast_stats']
+
+
+def _backfill_forecast_stats(cursor, ids: List[int]):
+    # database가 이 모듈을 import하므로 순환 import를 피해 호출 시점에 import
+    import database
+    database.backfill_forecast_stats(cursor, ids)
+
+
+def _backfill_search_index(cursor, ids: List[int]):
+    import database
+    database.backfill_search_index(cursor, ids)
+
+
+# 진행 중에 리포트 삭제(cleanup_old_reports)가 참고하는 백필 버전
+FORECAST_STATS_BACKFILL = 4
+
+MIGRATIONS = [
+    Migration(1, 'legacy_columns', _plan_legacy_columns),
+    Migration(2, 'index_reports_computer_timestamp', lambda cursor: [
+        # get_pc_history: WHERE computer_name = ? AND timestamp >= ? ORDER BY timestamp
+        'CREATE INDEX IF NOT EXISTS idx_reports_computer_timestamp ON pc_reports(computer_name, timestamp)'
+    ]),
+    Migration(3, 'backfill_active_email_accounts', backfill=Backfill(
+        # 컬럼 추가 전에 저장된 리포트는 NULL이라 json.loads가 실패함
+        table='pc_reports',
+        where='active_email_accounts IS NULL',
+        update=_fill_empty_email_accounts
+    )),
+    Migration(FORECAST_STATS_BACKFILL, 'backfill_forecast_stats', _plan_reset_forecast_stats, backfill=Backfill(
+        # 예측 기능 추가 전에 저장된 리포트를 회귀 합계에 반영
+        table='pc_reports',
+        where='1',
+        update=_backfill_forecast_stats,
+        snapshot=True
+    )),
+    Migration(5, 'backfill_search_index', backfill=Backfill(
+        # 검색 기능 추가 전부터 있던 PC를 색인 (적용 이후 리포트는 save_report가 색인)
+        table='pc_reports',
+        where='1',
+        update=_backfill_search_index,
+        snapshot=True
+    )),
+]
+
+
+# ==================== 실행 ====================
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """마이그레이션용 연결 (트랜잭션을 직접 BEGIN/COMMIT 으로 관리)"""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def connect_readonly(db_path: str) -> sqlite3.Connection:
+    """상태 조회용 연결 (query_only: 스키마와 데이터를 바꾸지 않고 쓰기 잠금도 잡지 않음)"""
+    conn = connect(db_path)
+    conn.execute('PRAGMA query_only = ON')
+    return conn
+
+
+def _ensure_schema_table(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            status TEXT NOT NULL,          -- 'backfill' (백필 진행 중) 또는 'done'
+            checkpoint INTEGER NOT NULL DEFAULT 0,
+            until_id INTEGER,              -- snapshot 백필의 마지막 대상 id (적용 시점의 MAX(id))
+            rows_done INTEGER NOT NULL DEFAULT 0,
+            applied_at TEXT,
+            finished_at TEXT
+        )
+    ''')
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(schema_migrations)')]
+    if 'until_id' not in columns:
+        try:
+            conn.execute('ALTER TABLE schema_migrations ADD COLUMN until_id INTEGER')
+        except sqlite3.OperationalError:
+            # 동시에 시작한 다른 워커가 먼저 추가함
+            pass
+
+
+def _read_applied(conn: sqlite3.Connection) -> Dict[int, Dict]:
+    """적용 기록 (schema_migrations 테이블이 아직 없으면 빈 딕셔너리)"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'"
+    ).fetchone()
+    if not exists:
+        return {}
+    return {row['version']: dict(row) for row in conn.execute('SELECT * FROM schema_migrations')}
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def get_status(db_path: str) -> List[Dict]:
+    """마이그레이션별 적용 상태 ('pending', 'backfill', 'done')"""
+    conn = connect_readonly(db_path)
+    try:
+        applied = _read_applied(conn)
+    finally:
+        conn.close()
+
+    status = []
+    for migration in MIGRATIONS:
+        row = applied.get(migration.version)
+        status.append({
+            'version': migration.version,
+            'name': migration.name,
+            'status': row['status'] if row else 'pending',
+            'rows_done': row['rows_done'] if row else 0,
+            'applied_at': row['applied_at'] if row else None,
+            'finished_at': row['finished_at'] if row else None
+        })
+    return status
+
+
+def _snapshot_until_id(cursor, migration: Migration) -> Optional[int]:
+    """snapshot 백필이면 지금 있는 마지막 행의 id (스키마 변경과 같은 트랜잭션에서 호출)"""
+    backfill = migration.backfill
+    if not backfill or not backfill.snapshot:
+        return None
+    return cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {backfill.table}').fetchone()[0]
+
+
+def pending_backfill_range(cursor, version: int) -> Optional[Tuple[int, int]]:
+    """
+    snapshot 백필이 아직 처리하지 않은 id 범위
+
+    Returns:
+        (checkpoint, until_id) - checkpoint < id <= until_id 인 행이 남아 있음
+        (백필이 끝났거나 적용되지 않았으면 None)
+    """
+    row = cursor.execute('''
+        SELECT checkpoint, until_id FROM schema_migrations
+        WHERE version = ? AND status = 'backfill'
+    ''', (version,)).fetchone()
+    if not row or row[1] is None:
+        return None
+    return row[0], row[1]
+
+
+def apply_schema_migrations(db_path: str) -> List[int]:
+    """
+    아직 적용되지 않은 마이그레이션의 스키마 변경 적용
+
+    여러 워커가 동시에 시작해도 BEGIN IMMEDIATE로 한 번씩만 적용됩니다.
+    백필이 있는 마이그레이션은 'backfill' 상태로 기록되고 run_backfills()에서 처리됩니다.
+
+    Returns:
+        이번에 적용한 버전 리스트
+    """
+    conn = connect(db_path)
+    _ensure_schema_table(conn)
+    applied = {row['version'] for row in conn.execute('SELECT version FROM schema_migrations')}
+    applied_now = []
+
+    try:
+        for migration in MIGRATIONS:
+            if migration.version in applied:
+                continue
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT status FROM schema_migrations WHERE version = ?',
+                                   (migration.version,)).fetchone()
+                if row:
+                    conn.execute('COMMIT')
+                    continue
+
+                cursor = conn.cursor()
+                for statement in migration.plan(cursor):
+                    cursor.execute(statement)
+
+                status = 'backfill' if migration.backfill else 'done'
+                until_id = _snapshot_until_id(cursor, migration)
+                conn.execute('''
+                    INSERT INTO schema_migrations (version, name, status, until_id, applied_at, finished_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (migration.version, migration.name, status, until_id, _now(),
+                      None if migration.backfill else _now()))
+                conn.execute('COMMIT')
+                applied_now.append(migration.version)
+                print(f"[마이그레이션] {migration.version:04d}_{migration.name} 적용")
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    finally:
+        conn.close()
+
+    return applied_now
+
+
+def _run_backfill_chunk(conn: sqlite3.Connection, migration: Migration) -> bool:
+    """
+    백필 한 덩어리 처리 (진행 위치와 같은 트랜잭션에서 커밋)
+
+    Returns:
+        더 처리할 행이 있으면 True
+    """
+    backfill = migration.backfill
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        row = conn.execute('SELECT status, checkpoint, until_id FROM schema_migrations WHERE version = ?',
+                           (migration.version,)).fetchone()
+        if not row or row['status'] != 'backfill':
+            conn.execute('COMMIT')
+            return False
+
+        cursor = conn.cursor()
+        args = backfill.range_args(row['checkpoint'], row['until_id']) + (backfill.chunk_size,)
+        ids = [r[0] for r in cursor.execute(backfill.select_sql(), args)]
+
+        if not ids:
+            conn.execute('''
+                UPDATE schema_migrations SET status = 'done', finished_at = ?
+                WHERE version = ?
+            ''', (_now(), migration.version))
+            conn.execute('COMMIT')
+            print(f"[마이그레이션] {migration.version:04d}_{migration.name} 백필 완료")
+            return False
+
+        backfill.update(cursor, ids)
+        conn.execute('''
+            UPDATE schema_migrations
+            SET checkpoint = ?, rows_done = rows_done + ?
+            WHERE version = ?
+        ''', (ids[-1], len(ids), migration.version))
+        conn.execute('COMMIT')
+        return True
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def run_backfills(db_path: str, stop_event: Optional[threading.Event] = None):
+    """진행 중인 백필을 끝까지 처리 (중단되면 다음 실행 때 저장된 위치부터 계속)"""
+    conn = connect(db_path)
+    try:
+        _ensure_schema_table(conn)
+        for migration in MIGRATIONS:
+            if not migration.backfill:
+                continue
+            while _run_backfill_chunk(conn, migration):
+                if stop_event is not None and stop_event.is_set():
+                    return
+                time.sleep(migration.backfill.pause)
+    finally:
+        conn.close()
+
+
+def start_backfill_worker(db_path: str) -> threading.Thread:
+    """백필을 백그라운드 스레드에서 실행 (서버 시작 시 호출)"""
+
+    def worker():
+        try:
+            run_backfills(db_path)
+        except Exception as e:
+            print(f"[마이그레이션] 백필 오류 (다음 시작 시 이어서 실행): {e}")
+
+    thread = threading.Thread(target=worker, name='db-backfill', daemon=True)
+    thread.start()
+    return thread
+
+
+# ==================== Dry run ====================
+
+def dry_run(db_path: str) -> List[Dict]:
+    """
+    적용 대기 중인 마이그레이션의 실행 계획과 예상 시간
+
+    원본 DB는 query_only 연결로 읽기만 하고, sqlite backup API로 만든 임시 복사본에서 측정합니다.
+    (WAL 모드라 복사하는 동안에도 서버의 리포트 저장은 막히지 않음)
+    스키마 변경은 복사본에서 실제로 실행해 시간을 재고,
+    백필은 첫 덩어리만 실행해 잰 시간으로 남은 행 수만큼 추정합니다.
+
+    Returns:
+        [{'version', 'name', 'status', 'statements', 'query_plan', 'rows', 'estimated_seconds'}, ...]
+    """
+    with tempfile.TemporaryDirectory(prefix='pc_monitoring_dry_run_') as temp_dir:
+        copy_path = os.path.join(temp_dir, 'dry_run.db')
+
+        conn = connect(copy_path)
+        try:
+            source = connect_readonly(db_path)
+            try:
+                source.backup(conn)
+            finally:
+                source.close()
+            return _measure_migrations(conn)
+        finally:
+            conn.close()
+
+
+def _measure_migrations(conn: sqlite3.Connection) -> List[Dict]:
+    """복사본 연결에서 대기 중인 마이그레이션을 실행해 보고 계획과 시간 측정 (끝나면 롤백)"""
+    applied = _read_applied(conn)
+    results = []
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for migration in MIGRATIONS:
+            row = applied.get(migration.version)
+            if row and row['status'] == 'done':
+                continue
+
+            cursor = conn.cursor()
+            result = {
+                'version': migration.version,
+                'name': migration.name,
+                'status': row['status'] if row else 'pending',
+                'statements': [],
+                'query_plan': [],
+                'rows': 0,
+                'estimated_seconds': 0.0
+            }
+
+            # 스키마 변경: 이후 마이그레이션도 이 결과를 보고 계획하도록 롤백 전까지 유지
+            if not row:
+                statements = [' '.join(s.split()) for s in migration.plan(cursor)]
+                start = time.perf_counter()
+                for statement in statements:
+                    cursor.execute(statement)
+                result['statements'] = statements
+                result['estimated_seconds'] += time.perf_counter() - start
+
+            backfill = migration.backfill
+            if backfill:
+                checkpoint = row['checkpoint'] if row else 0
+                until_id = row.get('until_id') if row else _snapshot_until_id(cursor, migration)
+                args = backfill.range_args(checkpoint, until_id)
+                result['query_plan'] = [
+                    r['detail'] for r in
+                    cursor.execute('EXPLAIN QUERY PLAN ' + backfill.select_sql(), args + (backfill.chunk_size,))
+                ]
+                remaining = cursor.execute(backfill.count_sql(), args).fetchone()[0]
+                result['rows'] = remaining
+
+                if remaining:
+                    cursor.execute('SAVEPOINT backfill_sample')
+                    start = time.perf_counter()
+                    ids = [r[0] for r in cursor.execute(backfill.select_sql(), args + (backfill.chunk_size,))]
+                    backfill.update(cursor, ids)
+                    elapsed = time.perf_counter() - start
+                    cursor.execute('ROLLBACK TO backfill_sample')
+                    cursor.execute('RELEASE backfill_sample')
+
+                    chunks = -(-remaining // backfill.chunk_size)
+                    result['estimated_seconds'] += elapsed / len(ids) * remaining + chunks * backfill.pause
+
+            results.append(result)
+    finally:
+        conn.execute('ROLLBACK')
+
+    return results
@@ -1,8 +1,17 @@
 // 전역 변수
-let pcReports = [];
+let pcReports = [];  // PC별 최신 리포트 요약 (/api/reports/summary)
 let alerts = [];
 let refreshInterval;
 
+// PC 목록 가상 스크롤 (화면에 보이는 행의 카드만 DOM에 유지)
+const PC_LIST_GAP = 20;             // style.css .pc-list gap과 동일
+const PC_LIST_OVERSCAN_ROWS = 2;    // 화면 위/아래로 미리 그려 둘 행 수
+const PC_ROW_HEIGHT_ESTIMATE = 420; // 카드 높이를 측정하기 전 사용할 예상 행 높이
+let pcRowHeight = 0;                // 측정된 행 높이 (gap 포함)
+let pcCardCache = new Map();        // computer_name -> { card, signature }
+let pcListRenderPending = false;
+let detailRequest = null;           // 상세 모달에서 조회 중인 컴퓨터 이름
+
 // 페이지 로드 시 실행
 document.addEventListener('DOMContentLoaded', function() {
     updateCurrentTime();
@@ -13,6 +22,13 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // 1초마다 시계 업데이트
     setInterval(updateCurrentTime, 1000);
+
+    // 스크롤/창 크기 변경 시 보이는 카드 다시 그리기
+    window.addEventListener('scroll', schedulePCListRender, { passive: true });
+    window.addEventListener('resize', function() {
+        pcRowHeight = 0;  // 열 수와 카드 높이가 바뀔 수 있으므로 다시 측정
+        schedulePCListRender();
+    });
 });
 
 // 현재 시간 업데이트
@@ -35,7 +51,7 @@ async function loadDashboardData() {
         // 병렬로 데이터 가져오기
         const [statsRes, reportsRes, alertsRes] = await Promise.all([
             fetch('/api/statistics'),
-            fetch('/api/reports/latest'),
+            fetch('/api/reports/summary'),
             fetch('/api/alerts')
         ]);
 
@@ -125,6 +141,9 @@ function updatePCList(reports) {
     const pcList = document.getElementById('pc-list');
 
     if (reports.length === 0) {
+        pcCardCache.clear();
+        pcList.style.paddingTop = '';
+        pcList.style.paddingBottom = '';
         pcList.innerHTML = `
             <div class="empty-state">
                 <div class="empty-state-icon">📭</div>
@@ -134,35 +153,135 @@ function updatePCList(reports) {
         return;
     }
 
-    pcList.innerHTML = '';
+    const emptyState = pcList.querySelector('.empty-state');
+    if (emptyState) {
+        emptyState.remove();
+    }
 
-    reports.forEach(report => {
-        const pcCard = createPCCard(report);
-        pcList.appendChild(pcCard);
+    renderVisiblePCCards();
+}
+
+// 스크롤 이벤트마다 그리지 않고 다음 프레임에 한 번만 그리기
+function schedulePCListRender() {
+    if (pcListRenderPending) return;
+    pcListRenderPending = true;
+
+    requestAnimationFrame(() => {
+        pcListRenderPending = false;
+        if (pcReports.length > 0) {
+            renderVisiblePCCards();
+        }
     });
 }
 
-// PC 카드 생성
-function createPCCard(report) {
-    const card = document.createElement('div');
-    card.className = 'pc-card';
-    card.onclick = () => showPCDetail(report);
+// 현재 그리드 열 수
+function getPCListColumns(pcList) {
+    const columns = getComputedStyle(pcList).gridTemplateColumns;
+    if (!columns || columns === 'none') return 1;
+    return Math.max(1, columns.split(' ').length);
+}
 
-    // 상태 판단
+// 화면에 보이는 행의 카드만 그리기 (위/아래 나머지 행은 padding으로 높이만 유지)
+function renderVisiblePCCards() {
+    const pcList = document.getElementById('pc-list');
+
+    if (!pcRowHeight) {
+        pcList.style.gridAutoRows = '';
+    }
+
+    const columns = getPCListColumns(pcList);
+    const rowHeight = pcRowHeight || PC_ROW_HEIGHT_ESTIMATE;
+    const totalRows = Math.ceil(pcReports.length / columns);
+
+    // 목록 맨 위 기준으로 현재 화면이 보여주는 범위
+    // (새로고침 후 PC 수가 줄어 스크롤 위치가 목록 끝을 넘으면 마지막 화면을 그림)
+    const viewTop = Math.min(-pcList.getBoundingClientRect().top, totalRows * rowHeight - window.innerHeight);
+    const viewBottom = viewTop + window.innerHeight;
+    const firstRow = Math.min(totalRows, Math.max(0, Math.floor(viewTop / rowHeight) - PC_LIST_OVERSCAN_ROWS));
+    const lastRow = Math.min(totalRows, Math.max(firstRow, Math.ceil(viewBottom / rowHeight) + PC_LIST_OVERSCAN_ROWS));
+
+    pcList.style.paddingTop = `${firstRow * rowHeight}px`;
+    pcList.style.paddingBottom = `${(totalRows - lastRow) * rowHeight}px`;
+
+    // computer_name 키로 기존 카드를 재사용하고 내용이 바뀐 카드만 다시 그림
+    const visibleReports = pcReports.slice(firstRow * columns, lastRow * columns);
+    const nextCache = new Map();
+    let cursor = pcList.firstElementChild;
+
+    visibleReports.forEach(report => {
+        const signature = getPCCardSignature(report);
+        let entry = pcCardCache.get(report.computer_name);
+
+        if (!entry) {
+            entry = { card: createPCCard(report), signature };
+        } else if (entry.signature !== signature) {
+            fillPCCard(entry.card, report);
+            entry.signature = signature;
+        }
+        nextCache.set(report.computer_name, entry);
+
+        // 순서가 맞지 않을 때만 DOM 이동
+        if (entry.card === cursor) {
+            cursor = cursor.nextElementSibling;
+        } else {
+            pcList.insertBefore(entry.card, cursor);
+        }
+    });
+
+    // 화면 밖으로 나간 카드 제거
+    while (cursor) {
+        const next = cursor.nextElementSibling;
+        cursor.remove();
+        cursor = next;
+    }
+    pcCardCache = nextCache;
+
+    // 카드 높이를 측정해 모든 행을 같은 높이로 고정 (더 큰 카드가 보이면 다시 계산)
+    let measured = 0;
+    pcCardCache.forEach(({ card }) => {
+        measured = Math.max(measured, card.offsetHeight - card.clientHeight + card.scrollHeight);
+    });
+    if (measured && measured + PC_LIST_GAP > pcRowHeight) {
+        pcRowHeight = measured + PC_LIST_GAP;
+        pcList.style.gridAutoRows = `${measured}px`;
+        schedulePCListRender();
+    }
+}
+
+// 카드 내용이 바뀌었는지 비교하기 위한 값 (상태/경과 일수는 시간에 따라 바뀌므로 날짜도 포함)
+function getPCCardSignature(report) {
+    return `${new Date().toDateString()}|${getPCStatus(report).status}|${JSON.stringify(report)}`;
+}
+
+// PC 상태 판단
+function getPCStatus(report) {
     const now = new Date();
     const reportTime = new Date(report.timestamp);
     const hoursAgo = (now - reportTime) / 1000 / 60 / 60;
 
-    let status = 'online';
-    let statusText = '정상';
-
     if (hoursAgo > 24) {
-        status = 'offline';
-        statusText = '오래됨';
-    } else if (hasWarnings(report)) {
-        status = 'warning';
-        statusText = '경고';
+        return { status: 'offline', statusText: '오래됨' };
+    }
+    if (hasWarnings(report)) {
+        return { status: 'warning', statusText: '경고' };
     }
+    return { status: 'online', statusText: '정상' };
+}
+
+// PC 카드 생성
+function createPCCard(report) {
+    const card = document.createElement('div');
+    card.className = 'pc-card';
+    fillPCCard(card, report);
+    return card;
+}
+
+// PC 카드 내용 채우기
+function fillPCCard(card, report) {
+    card.onclick = () => showPCDetail(report);
+
+    // 상태 판단
+    const { status, statusText } = getPCStatus(report);
 
     // 드라이브 정보 생성
     let drivesHTML = '';
@@ -188,9 +307,7 @@ function createPCCard(report) {
     }
 
     const displayName = report.display_name || report.user_name;
-    const primaryEmail = report.active_email_accounts && report.active_email_accounts.length > 0
-        ? report.active_email_accounts[0].email_address
-        : '-';
+    const primaryEmail = report.primary_email || '-';
 
     // 아카이브 날짜 표시 및 경고
     let archiveDateHTML = '';
@@ -245,7 +362,7 @@ function createPCCard(report) {
             </div>
             <div class="pc-info-row">
                 <span class="pc-info-label">📧 기간 메일:</span>
-                <span>${report.mail_info.period_emails || report.mail_info.today_emails || 0}개</span>
+                <span>${report.period_emails || 0}개</span>
             </div>
             <div class="pc-info-row">
                 <span class="pc-info-label">📦 PST 크기:</span>
@@ -260,8 +377,6 @@ function createPCCard(report) {
             ${drivesHTML}
         </div>
     `;
-
-    return card;
 }
 
 // 경고 여부 확인
@@ -279,14 +394,45 @@ function hasWarnings(report) {
     return false;
 }
 
-// PC 상세 정보 표시
-function showPCDetail(report) {
+// PC 상세 정보 표시 (PST 목록, 메일 계정 등 상세 데이터는 열 때 조회)
+async function showPCDetail(report) {
     const modal = document.getElementById('detail-modal');
     const modalTitle = document.getElementById('modal-title');
     const modalBody = document.getElementById('modal-body');
+    const computerName = report.computer_name;
 
-    modalTitle.textContent = `💻 ${report.computer_name} - 상세 정보`;
+    modalTitle.textContent = `💻 ${computerName} - 상세 정보`;
+    modalBody.innerHTML = `
+        <div class="loading">
+            <div class="spinner"></div>
+            상세 정보를 불러오는 중...
+        </div>
+    `;
+    modal.style.display = 'block';
+    detailRequest = computerName;
+
+    try {
+        const response = await fetch(`/api/reports/latest/${encodeURIComponent(computerName)}`);
+        const data = await response.json();
+
+        // 응답을 기다리는 동안 모달을 닫았거나 다른 PC를 열었으면 무시
+        if (detailRequest !== computerName) return;
+
+        if (data.status === 'success') {
+            modalBody.innerHTML = createPCDetailHTML(data.data);
+        } else {
+            modalBody.innerHTML = `<p style="color: #999;">${data.message}</p>`;
+        }
+    } catch (error) {
+        console.error('상세 정보 로드 실패:', error);
+        if (detailRequest === computerName) {
+            modalBody.innerHTML = '<p style="color: #999;">상세 정보를 불러오는 중 오류가 발생했습니다.</p>';
+        }
+    }
+}
 
+// PC 상세 정보 HTML 생성
+function createPCDetailHTML(report) {
     let detailHTML = `
         <div class="detail-section">
             <h3>📋 기본 정보</h3>
@@ -433,12 +579,12 @@ function showPCDetail(report) {
         `;
     }
 
-    modalBody.innerHTML = detailHTML;
-    modal.style.display = 'block';
+    return detailHTML;
 }
 
 // 모달 닫기
 function closeModal() {
+    detailRequest = null;
     document.getElementById('detail-modal').style.display = 'none';
 }
 